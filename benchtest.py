@@ -0,0 +1,34 @@
+#!/usr/bin/env python
+
+"""
+Benchtest
+
+Check doc/benchtest.txt for information.
+
+
+bench = ['rect',
+         'blits',
+         'mask_overlap',
+         'bitset',
+         'ndarray',
+         'event_queue',
+         'event_attr',
+         'sprite_draw',
+         'sprite_updates_1k',
+         'sprite_updates_10k']
+"""
+
+
+bench = []    #run specific cases if added to bench list, default all cases
+warmup = 5    #untimed calls of case before timing
+repeat = 10    #timed repetitions of case
+number = 10    #case calls per repetition
+output = None    #file to write JSON lines results, not used in browser
+
+
+import sys
+sys.dont_write_bytecode = True
+
+from test import benchtest
+
+benchtest.main(bench, warmup, repeat, number, output)
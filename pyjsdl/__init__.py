@@ -76,15 +76,17 @@ def init():
 init()
 
 
-def setup(callback, images=None):
+def setup(callback, images=None, timestep=None, maxsteps=5, render=None, sounds=None):
     """
     Initialize module for script execution.
 
     Argument include callback function to run and optional images list to preload.
     Callback function can also be an object with a run method to call.
     The images can be image URL, or file-like object or base64 data in format (name.ext,data).
+    Optional timestep (ms) runs callback at fixed simulation steps, see Clock.set_timestep.
+    Optional sounds list of sound file paths to preload before callback starts.
     """
-    display.setup(callback, images)
+    display.setup(callback, images, timestep, maxsteps, render, sounds)
 
 
 def set_callback(callback):
@@ -107,6 +109,16 @@ def setup_images(images):
     display.set_images(images)
 
 
+def setup_sounds(sounds):
+    """
+    Add sounds to sound preload list.
+
+    The argument is a sound or list of sounds representing a sound file path.
+    Sound preloading occurs at setup call.
+    """
+    display.setup_sounds(sounds)
+
+
 def quit():
     """
     Terminates canvas repaint and callback function.
@@ -9,7 +9,7 @@ The module controls display surface updates and registers interaction events.
 
 from pyjsdl.surface import Surface
 from pyjsdl.rect import Rect
-from pyjsdl.time import Time
+from pyjsdl.time import Time, FrameStats
 from pyjsdl import env
 from pyjsdl import constants as Const
 from pyjsdl.pyjsobj import RootPanel, SimplePanel, VerticalPanel, TextBox, TextArea
@@ -63,7 +63,18 @@ class Canvas(Surface):
         self._framerate = 0
         self._frametime = 0
         self._rendertime = self.time.time()
+        self._runtime = self._rendertime
+        self._accumulator = 0.0
+        self._timestep = 0
+        self._maxsteps = 5
+        self._alpha = 0.0
+        self._render = None
+        self._frame = 0
+        self._stats = FrameStats()
+        self._statframe = 0
+        self._calltime = 0.0
         self._pause = False
+        self._running = False
         self.initialized = False
 
     def _initiate(self):
@@ -253,6 +264,7 @@ class Canvas(Surface):
             self.event._updateQueue(self.evt[event.type](event))
 
     def onVisibilityChange(self, event):
+        self.time._scheduler._arm()
         if event.type in self.event.events:
             self.event._updateQueue(self.evt[event.type](event))
 
@@ -306,15 +318,26 @@ class Canvas(Surface):
         else:
             self.callback = cb
 
+    def set_timestep(self, timestep, maxsteps=5, render=None):
+        self._timestep = timestep
+        self._maxsteps = maxsteps
+        self._render = render
+        self._accumulator = 0.0
+        self._alpha = 0.0
+
     def start(self):
         if not self.initialized:
             self.initialized = True
+            self._running = True
             _wnd.requestAnimationFrame(run)
+            self.time._scheduler._arm()
 
     def stop(self):
         global run
         run = lambda ts: None
         self.run = lambda: None
+        self._running = False
+        self.time._scheduler._arm()
 
     def _get_rect(self):
         if self._rect_num < self._rect_len:
@@ -325,25 +348,63 @@ class Canvas(Surface):
             return self._rect_list[self._rect_num]
 
     def update(self, timestamp):
-        if not self._framerate:
-            self._frametime = timestamp - self._rendertime
+        self.time._scheduler.run(timestamp)
+        delta = timestamp - self._rendertime
+        self._rendertime = timestamp
+        if self._timestep:
+            self._frametime = delta
+            if self._pause:
+                return
+            self._accumulator += delta
+            steps = 0
+            while self._accumulator >= self._timestep:
+                if steps == self._maxsteps:
+                    self._accumulator = self._accumulator % self._timestep
+                    break
+                self.run()
+                self._accumulator -= self._timestep
+                steps += 1
+            self._alpha = self._accumulator / self._timestep
+            if self._render is not None:
+                self._render(self._alpha)
+        elif not self._framerate:
+            self._frametime = delta
             self.run()
         else:
-            self._frametime += timestamp - self._rendertime
-            if self._frametime > self._framerate:
+            self._accumulator += delta
+            if self._accumulator + 1.0 >= self._framerate:
+                self._frametime = timestamp - self._runtime
+                self._runtime = timestamp
                 self.run()
-                self._frametime = 0
-        self._rendertime = timestamp
+                self._accumulator -= self._framerate
+                if self._accumulator >= self._framerate:
+                    self._accumulator = 0.0
 
     def render(self):
+        time = self.time.time()
         while self._rect_num:
             rect = self._rect_list[self._rect_num-1]
             x,y,width,height = rect.x,rect.y,rect.width,rect.height
             _ctx.drawImage(_img, x,y,width,height, x,y,width,height)
             self._rect_num -= 1
+        if self._statframe != self._frame or self._timestep:
+            self._statframe = self._frame
+            rendertime = self.time.time() - time
+            self._stats.add(self._frametime, self._calltime, rendertime)
+            self._calltime = 0.0
+            if env.profiler is not None:
+                env.profiler.add('render', rendertime)
 
     def run(self):
+        time = self.time.time()
+        self._frame += 1
+        if self.event.replayer is not None:
+            self.event._replay(self._frame)
         self.callback.run()
+        time = self.time.time() - time
+        self._calltime += time
+        if env.profiler is not None:
+            env.profiler.add('callback', time)
 
 
 def run(timestamp):
@@ -412,7 +473,10 @@ class Display(object):
             self._callback = None
             self._image_list = []
             self._image_loading = False
+            self._sound_list = []
+            self._sound_loading = False
             self._canvas_init = False
+            self._timestep = None
             self._callbackAF = CallbackAF()
             self._initialized = True
 
@@ -436,21 +500,35 @@ class Display(object):
         self.surface = self.canvas.surface
         self.surface._display = self
         self._surface_rect = self.surface.get_rect()
-        if self._canvas_init and not self._image_loading:
+        if self._timestep is not None:
+            self.canvas.set_timestep(*self._timestep)
+            self._timestep = None
+        if self._canvas_init and not self._preloading():
             self.canvas.set_callback(self._callback)
             self._callback = None
             self.canvas.start()
             self._callbackAF.stop()
         return self.surface
 
-    def setup(self, callback, images=None):
+    def setup(self, callback, images=None, timestep=None, maxsteps=5, render=None, sounds=None):
         """
         Initialize Canvas for script execution.
 
         Argument include callback function to run and optional images list to preload.
         Callback function can also be an object with a run method to call.
         The images can be image URL, or base64 data in format (name.ext,data).
-        """
+        Optional timestep (ms) runs callback at fixed simulation steps, see Clock.set_timestep.
+        Timestep set before set_mode is applied when the canvas is created.
+        Optional sounds list of sound file paths to preload, see mixer.preload_sounds.
+        Callback starts when images and sounds are loaded.
+        """
+        if timestep is not None:
+            if render is None and hasattr(callback, 'render'):
+                render = callback.render
+            if self.canvas:
+                self.canvas.set_timestep(timestep, maxsteps, render)
+            else:
+                self._timestep = (timestep, maxsteps, render)
         if not self._canvas_init:
             if images is not None:
                 self._image_list.extend(images)
@@ -458,9 +536,15 @@ class Display(object):
                 pyjsdl.image.preload_images(self._image_list, self)
                 self._image_list = None
                 self._image_loading = True
+            if sounds is not None:
+                self._sound_list.extend(sounds)
+            if self._sound_list:
+                self._sound_loading = True
+                pyjsdl.mixer.preload_sounds(self._sound_list, self)
+                self._sound_list = None
             self._canvas_init = True
         if self.canvas:
-            if not self._image_loading:
+            if not self._preloading():
                 self.canvas.set_callback(callback)
                 if not self.canvas.initialized:
                     self.canvas.start()
@@ -468,7 +552,7 @@ class Display(object):
             else:
                 self._callback = callback
         else:
-            if not self._image_loading:
+            if not self._preloading():
                 self._callback = callback
                 self._callbackAF.set_callback(self._callback)
             else:
@@ -497,8 +581,31 @@ class Display(object):
             images = [images]
         self._image_list.extend(images)
 
+    def setup_sounds(self, sounds):
+        """
+        Add sounds to sound preload list.
+
+        The argument is a sound or list of sounds representing a sound file path.
+        Sound preloading occurs at display.setup call.
+        """
+        if isinstance(sounds, str):
+            sounds = [sounds]
+        self._sound_list.extend(sounds)
+
+    def _preloading(self):
+        return self._image_loading or self._sound_loading
+
     def _images_loaded(self):
         self._image_loading = False
+        self._preloaded()
+
+    def _sounds_loaded(self):
+        self._sound_loading = False
+        self._preloaded()
+
+    def _preloaded(self):
+        if self._preloading() or not self._canvas_init:
+            return
         if self.canvas:
             self.canvas.set_callback(self._callback)
             self._callback = None
@@ -643,12 +750,17 @@ class Display(object):
 
         Optional rect or rect list to specify regions to repaint.
         """
+        profiler = env.profiler
+        if profiler is not None:
+            profiler.start('update')
         if hasattr(rect_list, 'append'):
             _update(self.canvas, rect_list)
         elif rect_list:
             _update(self.canvas, [rect_list])
         else:
             self.flip()
+        if profiler is not None:
+            profiler.stop('update')
         return None
 
 
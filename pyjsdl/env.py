@@ -17,6 +17,8 @@ pyjs_mode = None
 
 event = None
 
+profiler = None
+
 
 def get_canvas():
     """
@@ -32,6 +34,13 @@ def get_frame():
     return frame
 
 
+def get_profiler():
+    """
+    Return active Profiler object.
+    """
+    return profiler
+
+
 def get_pyjsmode():
     """
     Return Pyjs mode object.
@@ -11,6 +11,7 @@ from pyjsdl import env
 from pyjsdl import key
 from pyjsdl import constants as Const
 from pyjsdl.pyjsobj import document
+import json
 
 
 class Event(object):
@@ -26,7 +27,14 @@ class Event(object):
         Module initialization creates pyjsdl.event instance.
         """
         self.eventQueue = [None for i in range(256)]
+        self.eventHead = 0
         self.eventNum = 0
+        self.eventLive = 0
+        self.eventSeq = 0
+        self.eventIndex = {}
+        self.eventIndexSeq = {}
+        self.eventIndexHead = {}
+        self.eventStale = {}
         self.eventQueueTmp = [None for i in range(256)]
         self.eventNumTmp = 0
         self.queueLock = False
@@ -127,6 +135,15 @@ class Event(object):
         self.keyHeld = {}
         self.keyCode = 0
         self.keyPressCode = {}
+        self.coalesce = set()
+        self.coalesceMerge = {Const.MOUSEMOTION: self._mergeMotion,
+                              Const.MOUSEWHEEL: self._mergeWheel}
+        self.wheelButtonNum = 0
+        self.eventPool = {}
+        self.eventClass = {}
+        self.noEvent = None
+        self.recorder = None
+        self.replayer = None
         self.Event = UserEvent
         self._nonimplemented_methods()
 
@@ -137,19 +154,92 @@ class Event(object):
         self.queueLock = False
 
     def _updateQueue(self, event):
+        if self.recorder is not None:
+            self.recorder.record(event)
+        if self.replayer is not None:
+            if self.replayer.block:
+                return
+        if env.profiler is None:
+            self._queueEvent(event)
+        else:
+            env.profiler.start('event')
+            self._queueEvent(event)
+            env.profiler.stop('event')
+
+    def _queueEvent(self, event):
         self.queueAccess = True
         if not self.queueLock:
             if self.eventNumTmp:
                  self._appendMerge()
-            self._append(event)
+            if event.type not in self.coalesce or not self._coalesce(event):
+                self._append(event)
         else:
-            self._appendTmp(event)
+            if event.type not in self.coalesce or not self._coalesceTmp(event):
+                self._appendTmp(event)
         self.queueAccess = False
 
+    def _coalesce(self, event):
+        eventType = event.type
+        if eventType not in self.eventIndex:
+            return False
+        if len(self.eventIndex[eventType]) == self.eventIndexHead[eventType]:
+            return False
+        if eventType == Const.MOUSEWHEEL:
+            seq = self.eventSeq - 1 - self.wheelButtonNum
+        else:
+            seq = self.eventSeq - 1
+        if self.eventIndexSeq[eventType][-1] != seq:
+            return False
+        self.coalesceMerge[eventType](self.eventIndex[eventType][-1], event)
+        if self.eventPool:
+            self.recycle([event])
+        return True
+
+    def _coalesceTmp(self, event):
+        if not self.eventNumTmp:
+            return False
+        evt = self.eventQueueTmp[self.eventNumTmp-1]
+        if evt.type != event.type:
+            return False
+        self.coalesceMerge[event.type](evt, event)
+        if self.eventPool:
+            self.recycle([event])
+        return True
+
+    def _mergeMotion(self, evt, event):
+        evt.rel = (evt.rel[0] + event.rel[0], evt.rel[1] + event.rel[1])
+        evt.pos = event.pos
+        evt.buttons = event.buttons
+        evt.event = event.event
+
+    def _mergeWheel(self, evt, event):
+        evt.x += event.x
+        evt.y += event.y
+        evt.precise_x += event.precise_x
+        evt.precise_y += event.precise_y
+        evt.event = event.event
+
     def _append(self, event):
+        if self.eventNum > 254 and self.eventLive < self.eventNum:
+            self._compact()
         if self.eventNum < 255:
             self.eventQueue[self.eventNum] = event
             self.eventNum += 1
+            self.eventLive += 1
+            eventType = event.type
+            if eventType not in self.eventIndex:
+                self.eventIndex[eventType] = []
+                self.eventIndexSeq[eventType] = []
+                self.eventIndexHead[eventType] = 0
+                self.eventStale[eventType] = 0
+            self.eventIndex[eventType].append(event)
+            self.eventIndexSeq[eventType].append(self.eventSeq)
+            self.eventSeq += 1
+            #count wheel button events appended since last wheel event
+            if isinstance(event, (MouseWheelDownEvent, MouseWheelUpEvent)):
+                self.wheelButtonNum += 1
+            else:
+                self.wheelButtonNum = 0
 
     def _appendTmp(self, event):
         if self.eventNumTmp < 255:
@@ -162,59 +252,153 @@ class Event(object):
             self.eventQueueTmp[i] = None
         self.eventNumTmp = 0
 
+    def _reset(self):
+        self.eventHead = 0
+        self.eventNum = 0
+        self.eventLive = 0
+        self.eventSeq = 0
+        self.wheelButtonNum = 0
+        for eventType in self.eventIndex:
+            if self.eventIndex[eventType]:
+                self.eventIndex[eventType] = []
+                self.eventIndexSeq[eventType] = []
+            self.eventIndexHead[eventType] = 0
+            self.eventStale[eventType] = 0
+
+    def _compact(self):
+        #remove queue entries of events retrieved by type or popped from head
+        num = 0
+        for i in range(self.eventHead, self.eventNum):
+            event = self.eventQueue[i]
+            if self.eventStale[event.type]:
+                self.eventStale[event.type] -= 1
+            else:
+                self.eventQueue[num] = event
+                num += 1
+        for i in range(num, self.eventNum):
+            self.eventQueue[i] = None
+        self.eventHead = 0
+        self.eventNum = num
+        for eventType in self.eventIndexHead:
+            head = self.eventIndexHead[eventType]
+            if head:
+                self.eventIndex[eventType] = self.eventIndex[eventType][head:]
+                self.eventIndexSeq[eventType] = (
+                    self.eventIndexSeq[eventType][head:])
+                self.eventIndexHead[eventType] = 0
+
+    def _pop(self):
+        #advance head pointers, popped entries are dropped on compaction
+        while True:
+            event = self.eventQueue[self.eventHead]
+            self.eventQueue[self.eventHead] = None
+            self.eventHead += 1
+            if self.eventStale[event.type]:
+                self.eventStale[event.type] -= 1
+            else:
+                break
+        self.eventIndexHead[event.type] += 1
+        self.eventLive -= 1
+        if not self.eventLive:
+            self._reset()
+        return event
+
+    def _take(self, eventType):
+        #remove indexed events of type from queue, return in queue order
+        if not isinstance(eventType, (tuple,list)):
+            if eventType not in self.eventIndex:
+                return self.queueNil
+            queue = self._index(eventType)
+            if not queue:
+                return self.queueNil
+            self.eventIndex[eventType] = []
+            self.eventIndexSeq[eventType] = []
+            self.eventIndexHead[eventType] = 0
+            self.eventStale[eventType] += len(queue)
+            self.eventLive -= len(queue)
+        else:
+            queues = []
+            seqs = []
+            for evtType in eventType:
+                if evtType in self.eventIndex:
+                    if len(self.eventIndex[evtType]) > self.eventIndexHead[evtType]:
+                        head = self.eventIndexHead[evtType]
+                        queues.append(self._index(evtType))
+                        seqs.append(self.eventIndexSeq[evtType][head:])
+                        self.eventIndex[evtType] = []
+                        self.eventIndexSeq[evtType] = []
+                        self.eventIndexHead[evtType] = 0
+                        self.eventStale[evtType] += len(queues[-1])
+                        self.eventLive -= len(queues[-1])
+            if not queues:
+                return self.queueNil
+            if len(queues) == 1:
+                queue = queues[0]
+            else:
+                queue = []
+                pos = [0 for i in range(len(queues))]
+                while True:
+                    sel = -1
+                    for i in range(len(queues)):
+                        if pos[i] < len(queues[i]):
+                            if sel < 0 or seqs[i][pos[i]] < seqs[sel][pos[sel]]:
+                                sel = i
+                    if sel < 0:
+                        break
+                    queue.append(queues[sel][pos[sel]])
+                    pos[sel] += 1
+        if not self.eventLive:
+            self._reset()
+        return queue
+
+    def _index(self, eventType):
+        head = self.eventIndexHead[eventType]
+        if not head:
+            return self.eventIndex[eventType]
+        return self.eventIndex[eventType][head:]
+
     def pump(self):
         """
         Process event queue.
 
         Process events to reduce queue overflow, unnecessary if processing with other methods.
         """
-        if self.eventNum > 250:
+        if self.eventNum - self.eventHead > 250:
             self._lock()
             self._pump()
             self._unlock()
         return None
 
     def _pump(self):
-        queue = self.eventQueue[50:self.eventNum]
-        self.eventNum -= 50
-        for i in range(self.eventNum):
-            self.eventQueue[i] = queue[i]
+        if self.eventLive < self.eventNum:
+            self._compact()
+        if self.eventNum > 250:
+            for i in range(50):
+                event = self.eventQueue[i]
+                self.eventQueue[i] = None
+                self.eventIndexHead[event.type] += 1
+            self.eventHead = 50
+            self.eventLive -= 50
 
     def get(self, eventType=None):
         """
         Return list of events, and queue is reset.
 
         Optional eventType argument of single or list of event type(s) to return.
+        Events are indexed by type, so retrieval by type only accesses events of that type.
         """
-        if not self.eventNum:
+        if not self.eventLive:
             return self.queueNil
         self._lock()
         if not eventType:
-            self.queue = self.eventQueue[0:self.eventNum]
-            self.eventNum = 0
-        else:
-            self.queue = []
-            if isinstance(eventType, (tuple,list)):
-                for i in range(self.eventNum):
-                    if self.eventQueue[i].type not in eventType:
-                        self.queueTmp.append(self.eventQueue[i])
-                    else:
-                        self.queue.append(self.eventQueue[i])
-            else:
-                for i in range(self.eventNum):
-                    if self.eventQueue[i].type != eventType:
-                        self.queueTmp.append(self.eventQueue[i])
-                    else:
-                        self.queue.append(self.eventQueue[i])
-            if not self.queueTmp:
-                self.eventNum = 0
+            if self.eventLive == self.eventNum - self.eventHead:
+                self.queue = self.eventQueue[self.eventHead:self.eventNum]
             else:
-                self.eventNum = len(self.queueTmp)
-                for i in range(self.eventNum):
-                    self.eventQueue[i] = self.queueTmp[i]
-                self.queueTmp[:] = []
-            if self.eventNum > 250:
-                self._pump()
+                self._compact()
+                self.queue = self.eventQueue[0:self.eventNum]
+            self._reset()
+        else:
+            self.queue = self._take(eventType)
         self._unlock()
         return self.queue
 
@@ -222,17 +406,15 @@ class Event(object):
         """
         Return an event from the queue.
 
-        Return event type NOEVENT if none present.
+        Return event type NOEVENT if none present, a shared event object.
         """
         self._lock()
-        if self.eventNum:
-            evt = self.eventQueue.pop(0)
-            self.eventNum -= 1
-            self.eventQueue.append(None)
-            if self.eventNum > 250:
-                self._pump()
+        if self.eventLive:
+            evt = self._pop()
         else:
-            evt = self.Event(Const.NOEVENT)
+            if self.noEvent is None:
+                self.noEvent = self.Event(Const.NOEVENT)
+            evt = self.noEvent
         self._unlock()
         return evt
 
@@ -243,19 +425,14 @@ class Event(object):
         Return None if queue is empty.
         Waiting not implemented.
         """
-        while True:
-            if self.eventNum:
-                self._lock()
-                evt = self.eventQueue.pop(0)
-                self.eventNum -= 1
-                self.eventQueue.append(None)
-                if self.eventNum > 250:
-                    self._pump()
-                self._unlock()
-                return evt
-            else:
-                self._unlock()
-                return None
+        if self.eventLive:
+            self._lock()
+            evt = self._pop()
+            self._unlock()
+            return evt
+        else:
+            self._unlock()
+            return None
 
     def peek(self, eventType=None):
         """
@@ -263,22 +440,19 @@ class Event(object):
 
         Optional eventType argument specifies event type or list, which defaults to all.
         """
-        if not self.eventNum:
+        if not self.eventLive:
             return False
         elif eventType is None:
             return True
-        self._lock()
-        evt = [event.type for event in self.eventQueue[0:self.eventNum]]
-        if self.eventNum > 250:
-            self._pump()
-        self._unlock()
         if isinstance(eventType, (tuple,list)):
             for evtType in eventType:
-                if evtType in evt:
-                    return True
+                if evtType in self.eventIndex:
+                    if len(self.eventIndex[evtType]) > self.eventIndexHead[evtType]:
+                        return True
         else:
-            if eventType in evt:
-                return True
+            if eventType in self.eventIndex:
+                if len(self.eventIndex[eventType]) > self.eventIndexHead[eventType]:
+                    return True
         return False
 
     def clear(self, eventType=None):
@@ -287,29 +461,13 @@ class Event(object):
 
         Optional eventType argument specifies event type or list, which defaults to all.
         """
-        if not self.eventNum:
+        if not self.eventLive:
             return None
         self._lock()
         if eventType is None:
-            self.eventNum = 0
+            self._reset()
         else:
-            if isinstance(eventType, (tuple,list)):
-                for i in range(self.eventNum):
-                    if self.eventQueue[i].type not in eventType:
-                        self.queueTmp.append(self.eventQueue[i])
-            else:
-                for i in range(self.eventNum):
-                    if self.eventQueue[i].type != eventType:
-                        self.queueTmp.append(self.eventQueue[i])
-            if not self.queueTmp:
-                self.eventNum = 0
-            else:
-                self.eventNum = len(self.queueTmp)
-                for i in range(self.eventNum):
-                    self.eventQueue[i] = self.queueTmp[i]
-                self.queueTmp[:] = []
-            if self.eventNum > 250:
-                self._pump()
+            self._take(eventType)
         self._unlock()
         return None
 
@@ -377,15 +535,152 @@ class Event(object):
         self._unlock()
         return None
 
+    def set_coalesce(self, eventType, setting=True):
+        """
+        Set coalescing of consecutive browser events of specified type(s).
+
+        Coalescing merges an event into the previous queued event of the
+        same type, MOUSEMOTION with accumulated rel and latest pos/buttons,
+        and MOUSEWHEEL with accumulated x/y rotation.
+        Optional setting to enable (default) or disable coalescing.
+        Coalescing is initially disabled.
+        """
+        if isinstance(eventType, (tuple,list)):
+            for evtType in eventType:
+                self.set_coalesce(evtType, setting)
+            return None
+        if eventType not in self.coalesceMerge:
+            raise ValueError('event type cannot be coalesced')
+        if setting:
+            self.coalesce = self.coalesce.union(set([eventType]))
+        else:
+            self.coalesce = self.coalesce.difference(set([eventType]))
+        return None
+
+    def get_coalesce(self, eventType):
+        """
+        Check if specified event type is coalesced.
+        """
+        return eventType in self.coalesce
+
+    def set_pool(self, setting=True):
+        """
+        Set pooling of browser event objects.
+
+        With pooling, event objects returned to the pool by recycle are
+        reinitialized for subsequent browser events rather than creating
+        new event objects. Optional setting to enable (default) or disable.
+        Pooling is initially disabled.
+        """
+        if setting:
+            if not self.eventPool:
+                for evt in self.eventObj:
+                    obj = self.eventObj[evt]
+                    self.eventClass[evt] = obj
+                    name = obj.__name__
+                    if name not in self.eventPool:
+                        self.eventPool[name] = EventPool(obj)
+                    self.eventObj[evt] = self.eventPool[name].get
+        else:
+            if self.eventPool:
+                for evt in self.eventClass:
+                    self.eventObj[evt] = self.eventClass[evt]
+                self.eventClass = {}
+                self.eventPool = {}
+        return None
+
+    def get_pool(self):
+        """
+        Check if browser event objects are pooled.
+        """
+        return bool(self.eventPool)
+
+    def recycle(self, events=None):
+        """
+        Return event objects to pool for reuse.
+
+        Optional events argument of event list, defaults to events last returned by get.
+        Recycled events should no longer be referenced, as the objects are reinitialized for new browser events.
+        Events already in the pool are not added again.
+        Recycling requires pooling enabled with set_pool.
+        """
+        if not self.eventPool:
+            return None
+        if events is None or events is self.queue:
+            events = self.queue
+            self.queue = self.queueNil
+        for event in events:
+            name = event.__class__.__name__
+            if name in self.eventPool:
+                self.eventPool[name].put(event)
+        return None
+
+    def set_record(self, setting=True):
+        """
+        Set recording of browser events.
+
+        Recording logs each browser event with frame number and time,
+        retrieved as JSON-lines data with get_record.
+        Optional setting to start (default) or stop recording.
+        Starting a recording discards the previous recording.
+        """
+        if setting:
+            self.recorder = EventRecorder()
+        else:
+            if self.recorder is not None:
+                self.recorder.stop()
+        return None
+
+    def get_record(self):
+        """
+        Return recorded events as JSON-lines data.
+
+        Each line holds a recorded event as an object with frame (f), time in ms (t), event type (type) and event attributes (attr).
+        """
+        if self.recorder is not None:
+            return self.recorder.get_data()
+        else:
+            return ''
+
+    def set_replay(self, data, block=True):
+        """
+        Replay recorded events.
+
+        Argument data is JSON-lines data from get_record, or None to stop replay.
+        Recorded events are queued at the frame relative to the replay start that matches the recording.
+        Optional block to ignore browser events during replay, defaults to True.
+        Replay reproduces queued events, not mouse/key state.
+        """
+        if data is not None:
+            self.replayer = EventReplay(data, block)
+        else:
+            self.replayer = None
+        return None
+
+    def get_replay(self):
+        """
+        Check if replay is in progress.
+        """
+        return self.replayer is not None
+
+    def _replay(self, frame):
+        if not self.replayer.run(frame):
+            self.replayer = None
+
     def _set_mouse_event(self):
         self.mouseEvt['pos'] = _Evt()
         self.mouseEvt['pre'] = _Evt()
         self.mouseEvt['rel'] = _Evt()
 
     def _set_key_event(self):
+        pooled = bool(self.eventPool)
+        if pooled:
+            self.set_pool(False)
         self.eventObj['keydown'] = _KeyDownEvent
         self.eventObj['keyup'] = _KeyUpEvent
         self.eventObj['keypress'] = _KeyPressEvent
+        if pooled:
+            self.set_pool(True)
 
     def _initiate_touch_listener(self, canvas):
         self.touchlistener = TouchListener(canvas)
@@ -409,7 +704,16 @@ class UserEvent(object):
     UserEvent object.
     """
 
-    __slots__ = ['type', 'attr']
+    __slots__ = ['type', 'attr',
+                 'pos', 'rel', 'buttons', 'button',
+                 'key', 'mod', 'unicode', 'scancode',
+                 'x', 'y', 'precise_x', 'precise_y',
+                 'gain', 'state', 'code']
+
+    _fields = set(['pos', 'rel', 'buttons', 'button',
+                   'key', 'mod', 'unicode', 'scancode',
+                   'x', 'y', 'precise_x', 'precise_y',
+                   'gain', 'state', 'code'])
 
     def __init__(self, eventType, *args, **kwargs):
         """
@@ -417,6 +721,10 @@ class UserEvent(object):
 
         Argument includes eventType (USEREVENT+num).
         Optional attribute argument as dictionary ({str:val}) or keyword arg(s).
+        Common event attributes are held in slots for direct access,
+        other attributes are held in the attr dictionary.
+        Pyjs -O mode without __getattr__/__setattr__ sets other attributes
+        directly, and later changes are not reflected in attr.
         Return user event.
         """
         if args:
@@ -424,10 +732,17 @@ class UserEvent(object):
         else:
             attr = kwargs
         object.__setattr__(self, "type", eventType)
-        object.__setattr__(self, "attr", attr)
-        if env.pyjs_mode.optimized: #__getattr__ not implemented in pyjs -O
-            for attr in self.attr:
-                object.__setattr__(self, attr, self.attr[attr])
+        overflow = {}
+        for name in attr:
+            if name in self._fields:
+                object.__setattr__(self, name, attr[name])
+            else:
+                overflow[name] = attr[name]
+        object.__setattr__(self, "attr", overflow)
+        if overflow and env.pyjs_mode.optimized:
+            #__getattr__ not implemented in pyjs -O
+            for name in overflow:
+                object.__setattr__(self, name, overflow[name])
         env.event._register_event(eventType)
 
     def __str__(self):
@@ -444,11 +759,23 @@ class UserEvent(object):
                 "'Event' object has no attribute '%s'" % attr)
 
     def __setattr__(self, attr, value):
-        self.attr[attr] = value
+        if attr in self._fields or attr in ('type', 'attr'):
+            object.__setattr__(self, attr, value)
+        else:
+            self.attr[attr] = value
+
+    def _get_attr(self):
+        attr = {}
+        for name in self.__slots__[2:]:
+            if hasattr(self, name):
+                attr[name] = getattr(self, name)
+        for name in self.attr:
+            attr[name] = self.attr[name]
+        return attr
 
     def toString(self):
         event_name = env.event.event_name(self.type)
-        return "<Event(%s-%s %r)>" % (self.type, event_name, self.attr)
+        return "<Event(%s-%s %r)>" % (self.type, event_name, self._get_attr())
 
 
 class JEvent(object):
@@ -474,11 +801,15 @@ class JEvent(object):
     def __repr__(self):
         return self.toString()
 
-    def toString(self):
-        event_name = self._eventName[self.type]
+    def _get_attr(self):
         attr = {}
         for name in self.__slots__[1:-1]:
             attr[name] = getattr(self, name)
+        return attr
+
+    def toString(self):
+        event_name = self._eventName[self.type]
+        attr = self._get_attr()
         return "<Event(%s-%s %r)>" % (self.type, event_name, repr(attr))
 
     def getEvent(self):
@@ -1016,6 +1347,137 @@ class PageHide(JEvent):
         self.type = Const.QUIT
 
 
+class EventPool(list):
+    """
+    EventPool object.
+    """
+
+    def __init__(self, eventObj):
+        """
+        Initialize EventPool object.
+
+        Pool of event objects of eventObj class accessed through get method, which returns a pooled event reinitialized with the arguments or a new event if the pool is empty.
+        Event objects are returned to the pool with put.
+        """
+        list.__init__(self)
+        self.eventObj = eventObj
+        self.pooled = {}
+
+    def get(self, *args):
+        """
+        Return an event initialized with the arguments.
+        """
+        if self:
+            evt = self.pop()
+            del self.pooled[id(evt)]
+            evt.__init__(*args)
+            return evt
+        else:
+            return self.eventObj(*args)
+
+    def put(self, evt):
+        """
+        Return event to the pool, unless already pooled.
+        """
+        if id(evt) not in self.pooled:
+            self.pooled[id(evt)] = True
+            self.append(evt)
+        return None
+
+
+class EventRecorder(object):
+    """
+    EventRecorder object.
+    """
+
+    def __init__(self):
+        """
+        Initialize EventRecorder object.
+
+        Record browser events with frame number relative to recording start and time (ms) since recording start.
+        Module event.set_record creates EventRecorder instance.
+        """
+        self.frame = env.canvas._frame
+        self.time = env.canvas.time.time()
+        self.data = []
+        self.active = True
+
+    def record(self, event):
+        """
+        Record event.
+        """
+        if not self.active:
+            return
+        attr = event._get_attr()
+        for name in attr:
+            if isinstance(attr[name], tuple):
+                attr[name] = list(attr[name])
+        record = {'f': env.canvas._frame - self.frame,
+                  't': round(env.canvas.time.time() - self.time, 3),
+                  'type': event.type,
+                  'attr': attr}
+        self.data.append(json.dumps(record))
+
+    def stop(self):
+        """
+        Stop recording.
+        """
+        self.active = False
+
+    def get_data(self):
+        """
+        Return recorded events as JSON-lines data.
+        """
+        return '\n'.join(self.data)
+
+
+class EventReplay(object):
+    """
+    EventReplay object.
+    """
+
+    def __init__(self, data, block=True):
+        """
+        Initialize EventReplay object.
+
+        Argument data is JSON-lines data of recorded events.
+        Optional block to ignore browser events during replay.
+        Module event.set_replay creates EventReplay instance.
+        """
+        self.records = []
+        for line in data.split('\n'):
+            if line.strip():
+                record = json.loads(line)
+                attr = {}
+                for name in record['attr']:
+                    val = record['attr'][name]
+                    if isinstance(val, list):
+                        val = tuple(val)
+                    attr[str(name)] = val
+                self.records.append((record['f'], record['type'], attr))
+        self.index = 0
+        self.frame = None
+        self.block = block
+
+    def run(self, frame):
+        """
+        Queue events recorded at frame relative to replay start.
+
+        Return False when replay is complete.
+        """
+        if self.frame is None:
+            self.frame = frame
+        frame -= self.frame
+        while self.index < len(self.records):
+            record = self.records[self.index]
+            if record[0] > frame:
+                break
+            if record[1] in env.event.events:
+                env.event._queueEvent(UserEvent(record[1], record[2]))
+            self.index += 1
+        return self.index < len(self.records)
+
+
 class _Evt(object):
 
     __slots__ = ['x', 'y']
@@ -31,17 +31,24 @@ class Mixer:
         self._channels = {}
         self._channel_available = [id for id in
                                    range(self._channel_max-1,-1,-1)]
-        self._channel_active = []
+        self._channel_free = {}
+        self._channel_active = {}
         self._channel_reserved = []
         self._channel_reserved_num = 0
-        self._channel_process = set()
-        self._channel_process_end = set()
+        self._channel_seq = 0
+        self._voice_steal = None
+        self._scheduled = set()
         for id in range(self._channel_max):
             self._get_channel(id)
+            self._channel_free[id] = True
         self.music = Music()
+        self._webaudio = None
+        self._webaudio_engine = None
+        self._preloaded = {}
+        self._loader = None
         self._time = Time()
         self._timerid = 0
-        self._processing = False
+        self._fade_curve = 'linear'
         self._active = False
         self._initialized = True
 
@@ -69,6 +76,84 @@ class Mixer:
         self._initialized = False
         return None
 
+    def set_engine(self, engine):
+        """
+        Set mixer audio engine.
+
+        Argument engine is 'audio' for HTML Audio elements (default) or 'webaudio' for Web Audio API.
+        With 'webaudio', subsequently loaded sounds are decoded to AudioBuffer shared across plays, each play uses an AudioBufferSourceNode through the channel GainNode, fades are gain ramps and maxtime is a scheduled stop. Music continues to stream with Audio element.
+        Engine 'audio' is retained if Web Audio is not supported.
+        Return engine set.
+        """
+        if engine == 'webaudio':
+            if self._webaudio_engine is None:
+                self._webaudio_engine = WebAudio()
+            if self._webaudio_engine.context is not None:
+                self._webaudio = self._webaudio_engine
+        elif engine == 'audio':
+            self._webaudio = None
+        else:
+            raise ValueError('unknown audio engine')
+        return self.get_engine()
+
+    def get_engine(self):
+        """
+        Get mixer audio engine, 'audio' or 'webaudio'.
+        """
+        if self._webaudio is not None:
+            return 'webaudio'
+        else:
+            return 'audio'
+
+    def preload_sounds(self, sounds, callback_obj=None, progress=None):
+        """
+        Preload sounds list.
+
+        Argument sounds is a list of sound file paths, retrieved by Sound of the same path.
+        With 'webaudio' engine, sounds are fetched and decoded to the buffer cache, otherwise Audio elements are loaded until playable.
+        Provide a callback_obj with _sounds_loaded method to be notified of preloading completion.
+        Optional progress function is called with loaded and total count as each sound completes.
+        """
+        self._loader = SoundLoader(self, callback_obj, progress)
+        self._loader.load_sounds(sounds[:])
+        return None
+
+    def get_preload_progress(self):
+        """
+        Get sound preloading progress.
+
+        Return tuple of loaded and total count.
+        """
+        if self._loader is None:
+            return (0, 0)
+        return (self._loader.loaded, self._loader.total)
+
+    def set_cache_budget(self, size):
+        """
+        Set memory budget of decoded sound cache.
+
+        Argument size in bytes, 0 for unlimited.
+        Least recently used buffers are released from cache when budget is exceeded, sounds retain buffers already set.
+        Applies to 'webaudio' engine.
+        """
+        if self._webaudio_engine is None:
+            self._webaudio_engine = WebAudio()
+        self._webaudio_engine.set_budget(size)
+        return None
+
+    def get_cache_size(self):
+        """
+        Get memory in bytes of decoded sound cache.
+        """
+        if self._webaudio_engine is None:
+            return 0
+        return self._webaudio_engine.get_size()
+
+    def _get_preloaded(self, path):
+        if path in self._preloaded:
+            return self._preloaded.pop(path)
+        return None
+
     def get_init(self):
         """
         Get the audio format initialized.
@@ -82,7 +167,7 @@ class Mixer:
         """
         Stop mixer channels.
         """
-        for id in self._channel_active:
+        for id in list(self._channel_active):
             if id > -1:
                 self._channels[id].stop()
         return None
@@ -91,7 +176,7 @@ class Mixer:
         """
         Fadeout mixer channels in given time.
         """
-        for id in self._channel_active:
+        for id in list(self._channel_active):
             if id > -1:
                 self._channels[id].fadeout(time)
         return None
@@ -100,7 +185,7 @@ class Mixer:
         """
         Pause mixer channels.
         """
-        for id in self._channel_active:
+        for id in list(self._channel_active):
             if id > -1:
                 self._channels[id].pause()
         return None
@@ -109,7 +194,7 @@ class Mixer:
         """
         Unpause mixer channels.
         """
-        for id in self._channel_active:
+        for id in list(self._channel_active):
             if id > -1:
                 self._channels[id].unpause()
         return None
@@ -125,6 +210,7 @@ class Mixer:
             self._channel_max = count
             for id in range(current, count):
                 self._get_channel(id)
+                self._channel_free[id] = True
                 self._channel_available.insert(0, id)
         elif count >= 0:
             current = self._channel_max
@@ -134,8 +220,10 @@ class Mixer:
                     if self._channels[id] is not None:
                         self._channels[id].stop()
                     del self._channels[id]
-                if id in self._channel_available:
-                    self._channel_available.remove(id)
+                if id in self._channel_free:
+                    del self._channel_free[id]
+            if self._channel_reserved_num > count:
+                self.set_reserved(count)
         return None
 
     def get_num_channels(self):
@@ -155,27 +243,45 @@ class Mixer:
         elif count < 0:
             count = 0
         self._channel_reserved_num = count
-        self._channel_reserved = []
-        for id in range(self._channel_reserved_num):
-            self._channel_reserved.append(id)
-            if id in self._channel_available:
-                self._channel_available.remove(id)
+        free = self._channel_free
+        self._channel_reserved = [id for id in range(count-1,-1,-1)
+                                  if free[id]]
+        self._channel_available = [id for id in
+                                   range(self._channel_max-1,count-1,-1)
+                                   if free[id]]
         return None
 
+    def set_voice_steal(self, mode=None):
+        """
+        Set voice stealing of Sound.play when all channels are active.
+
+        Argument mode is 'oldest' to stop the longest playing channel, 'quietest' to stop the lowest volume channel, or None (default) for no stealing.
+        A channel playing a sound of higher priority is not stolen, and lower priority channels are stolen first.
+        Reserved channels are not stolen.
+        """
+        if mode not in (None, 'oldest', 'quietest'):
+            raise ValueError('unknown voice steal mode')
+        self._voice_steal = mode
+        return None
+
+    def get_voice_steal(self):
+        """
+        Get voice stealing mode.
+        """
+        return self._voice_steal
+
     def find_channel(self, force=False):
         """
         Get an inactive mixer channel.
 
         Optional force attribute return longest running channel if all active.
         """
-        if self._channel_available:
-            id = self._channel_available.pop()
-            self._channel_available.insert(0, id)
+        id = self._peek_channel(self._channel_available)
+        if id is not None:
             return self._channels[id]
         if self._channel_reserved_num:
-            if self._channel_reserved:
-                id = self._channel_reserved.pop()
-                self._channel_reserved.insert(0, id)
+            id = self._peek_channel(self._channel_reserved)
+            if id is not None:
                 return self._channels[id]
         if not force:
             return None
@@ -183,10 +289,12 @@ class Mixer:
         longest_reserved = None
         for id in self._channel_active:
             if id > self._channel_reserved_num-1:
-                longest = id
-                break
+                if (longest is None or self._channel_active[id]
+                                        < self._channel_active[longest]):
+                    longest = id
             elif id > -1:
-                if longest_reserved is None:
+                if (longest_reserved is None or self._channel_active[id]
+                                < self._channel_active[longest_reserved]):
                     longest_reserved = id
         if longest is not None:
             channel = longest
@@ -207,62 +315,148 @@ class Mixer:
                     return True
         return False
 
-    def _process(self, id):
-        self._channel_process.add(id)
-        if not self._processing:
-            self._processing = True
-            self._timerid = self._time.set_interval(self, 10)
+    def set_fade_curve(self, curve):
+        """
+        Set fade curve.
+
+        Argument curve is 'linear' (default) or 'exponential', applied to subsequent fade-in and fadeout.
+        """
+        if curve not in ('linear', 'exponential'):
+            raise ValueError('unknown fade curve')
+        self._fade_curve = curve
+        return None
+
+    def get_fade_curve(self):
+        """
+        Get fade curve.
+        """
+        return self._fade_curve
+
+    def _schedule(self, channel):
+        self._scheduled = self._scheduled.union([channel._id])
+        self._arm()
+
+    def _unschedule(self, channel):
+        if channel._id in self._scheduled:
+            self._scheduled = self._scheduled.difference([channel._id])
+            self._arm()
+
+    def _arm(self):
+        if self._timerid:
+            self._time.clear_timeout(self._timerid)
+            self._timerid = 0
+        if not self._scheduled:
+            return
+        next = None
+        for id in self._scheduled:
+            time = self._channels[id]._get_next()
+            if time is not None:
+                if next is None or time < next:
+                    next = time
+        if next is not None:
+            delay = next - self._time.time()
+            if delay < 0:
+                delay = 0
+            self._timerid = self._time.set_timeout(self, delay)
 
     def run(self):
         """
         Mixer processing.
+
+        Evaluates fade envelopes and maxtime of scheduled channels that are due, and sets timeout to next due time.
         """
-        if self._active:
-            for id in self._channel_process:
-                complete = self._channels[id]._process()
-                if complete:
-                    self._channel_process_end.add(id)
-            if self._channel_process_end:
-                for i in range(len(self._channel_process_end)):
-                    id = self._channel_process_end.pop()
-                    self._channel_process.discard(id)
-                if not self._channel_process:
-                    self._processing = False
-                    self._time.clear_interval(self._timerid)
-        else:
-            if self._channel_process:
-                for i in range(len(self._channel_process)):
-                    self._channel_process.pop()
-            self._processing = False
-            self._time.clear_interval(self._timerid)
+        self._timerid = 0
+        time = self._time.time()
+        complete = []
+        for id in self._scheduled:
+            if self._channels[id]._update(time):
+                complete.append(id)
+        if complete:
+            self._scheduled = self._scheduled.difference(complete)
+        self._arm()
 
     def _activate_channel(self, id):
-        if id > self._channel_reserved_num-1:
-            self._channel_available.remove(id)
-        elif id > -1:
-            self._channel_reserved.remove(id)
-        self._channel_active.append(id)
+        self._channel_free[id] = False
+        self._channel_seq += 1
+        self._channel_active[id] = self._channel_seq
         self._active = True
 
     def _deactivate_channel(self, id):
-        self._channel_active.remove(id)
+        if id in self._channel_active:
+            del self._channel_active[id]
         if not self._channel_active:
             self._active = False
 
     def _restore_channel(self, id):
         if id > self._channel_reserved_num-1:
-            self._channel_available.append(id)
+            stack = self._channel_available
         elif id > -1:
-            self._channel_reserved.append(id)
-
-    def _retrieve_channel(self):
-        if self._channel_available:
-            id = self._channel_available.pop()
-            self._channel_active.append(id)
-            self._active = True
-            return self._channels[id]
+            stack = self._channel_reserved
         else:
-            return None
+            return
+        if id in self._channel_free and not self._channel_free[id]:
+            self._channel_free[id] = True
+            stack.append(id)
+            if len(stack) > 2 * self._channel_max:
+                self.set_reserved(self._channel_reserved_num)
+
+    def _peek_channel(self, stack):
+        while stack:
+            id = stack[-1]
+            if id in self._channel_free and self._channel_free[id]:
+                return id
+            stack.pop()
+        return None
+
+    def _retrieve_channel(self, sound=None):
+        if sound is not None:
+            if sound._max_instances:
+                while sound._count >= sound._max_instances:
+                    if not self._steal_channel(sound, True):
+                        return None
+        id = self._peek_channel(self._channel_available)
+        if id is None:
+            if sound is None or self._voice_steal is None:
+                return None
+            if not self._steal_channel(sound, False):
+                return None
+            id = self._peek_channel(self._channel_available)
+            if id is None:
+                return None
+        self._channel_available.pop()
+        self._activate_channel(id)
+        return self._channels[id]
+
+    def _steal_channel(self, sound, instance):
+        victim = None
+        for id in self._channel_active:
+            if id < self._channel_reserved_num:
+                continue
+            channel = self._channels[id]
+            if channel._sound is None:
+                continue
+            if instance:
+                if channel._sound is not sound:
+                    continue
+            elif channel._sound._priority > sound._priority:
+                continue
+            if victim is None or self._steal_order(channel, victim):
+                victim = channel
+        if victim is None:
+            return False
+        victim.stop()
+        return True
+
+    def _steal_order(self, channel, victim):
+        if channel._sound._priority != victim._sound._priority:
+            return channel._sound._priority < victim._sound._priority
+        if self._voice_steal == 'quietest':
+            volume = channel._get_level()
+            victim_volume = victim._get_level()
+            if volume != victim_volume:
+                return volume < victim_volume
+        return (self._channel_active[channel._id]
+                < self._channel_active[victim._id])
 
     def _get_channel(self, id):
         if id in self._channels:
@@ -278,6 +472,274 @@ class Mixer:
             raise IndexError('invalid channel index')
 
 
+class WebAudio(object):
+    """
+    WebAudio object.
+    """
+
+    def __init__(self):
+        """
+        Initialize Web Audio engine.
+
+        Creates AudioContext, context is None if Web Audio is not supported.
+        Decoded AudioBuffer are cached by sound path.
+        """
+        self.context = JS("""(function() {
+            var AudioContext = $wnd['AudioContext'] || $wnd['webkitAudioContext'];
+            return AudioContext ? new AudioContext() : null;
+        })()""")
+        self._buffers = {}
+        self._sizes = {}
+        self._order = []
+        self._size = 0
+        self._budget = 0
+        self._loading = {}
+
+    def resume(self):
+        """
+        Resume AudioContext suspended by browser autoplay policy.
+        """
+        if self.context.state == 'suspended':
+            self.context.resume()
+        return None
+
+    def get_time(self):
+        """
+        Return AudioContext time (in seconds).
+        """
+        return self.context.currentTime
+
+    def set_budget(self, size):
+        """
+        Set memory budget (bytes) of buffer cache, 0 for unlimited.
+        """
+        self._budget = size
+        self._evict()
+        return None
+
+    def get_size(self):
+        """
+        Return memory (bytes) of buffer cache.
+        """
+        return self._size
+
+    def get_buffer(self, path):
+        """
+        Return cached buffer of sound path, or None if not cached.
+        """
+        if path not in self._buffers:
+            return None
+        if self._order[-1] != path:
+            self._order.remove(path)
+            self._order.append(path)
+        return self._buffers[path]
+
+    def _cache(self, path, buffer):
+        size = buffer.length * buffer.numberOfChannels * 4
+        if path in self._buffers:
+            self._size -= self._sizes[path]
+            self._order.remove(path)
+        self._buffers[path] = buffer
+        self._sizes[path] = size
+        self._size += size
+        self._order.append(path)
+        self._evict()
+
+    def _evict(self):
+        while (self._budget and self._size > self._budget
+               and len(self._order) > 1):
+            path = self._order.pop(0)
+            self._size -= self._sizes[path]
+            del self._sizes[path]
+            del self._buffers[path]
+
+    def load(self, path, sound):
+        """
+        Fetch and decode sound path, and set buffer to sound when available.
+        """
+        buffer = self.get_buffer(path)
+        if buffer is not None:
+            sound._set_buffer(buffer)
+            return None
+        if path in self._loading:
+            self._loading[path].append(sound)
+            return None
+        self._loading[path] = [sound]
+        context = self.context
+        success = lambda buffer: self._decoded(path, buffer)
+        failed = lambda err: self._failed(path)
+        JS("""
+        var request = new XMLHttpRequest();
+        request.open('GET', @{{path}}, true);
+        request.responseType = 'arraybuffer';
+        request.onload = function() {
+            if (request.status && request.status != 200) {
+                @{{failed}}(null);
+            } else {
+                @{{context}}.decodeAudioData(request.response, @{{success}}, @{{failed}});
+            }
+        };
+        request.onerror = @{{failed}};
+        request.send();
+        """)
+        return None
+
+    def _decoded(self, path, buffer):
+        self._cache(path, buffer)
+        if path in self._loading:
+            for sound in self._loading.pop(path):
+                sound._set_buffer(buffer)
+
+    def _failed(self, path):
+        if path in self._loading:
+            for sound in self._loading.pop(path):
+                sound._set_element(path)
+
+
+class SoundLoader(object):
+    """
+    SoundLoader object.
+    """
+
+    def __init__(self, mixer, callback_obj, progress):
+        """
+        Initialize sound loader.
+
+        Loads sound list, and notifies progress and completion.
+        """
+        self.mixer = mixer
+        self.callback_obj = callback_obj
+        self.progress = progress
+        self.loaded = 0
+        self.total = 0
+        self._complete = False
+
+    def load_sounds(self, sounds):
+        """
+        Load sounds list.
+        """
+        paths = []
+        for sound in sounds:
+            path = sound.replace('\\','/')
+            if path not in paths:
+                paths.append(path)
+        self.total = len(paths)
+        if not self.total:
+            self._completed()
+            return None
+        for path in paths:
+            if self.mixer._webaudio is not None:
+                self.mixer._webaudio.load(path, _SoundPreload(self, path))
+            else:
+                _AudioPreload(self, path)
+        return None
+
+    def _loaded(self, path):
+        self.loaded += 1
+        if self.progress is not None:
+            self.progress(self.loaded, self.total)
+        if self.loaded == self.total:
+            self._completed()
+
+    def _completed(self):
+        if not self._complete:
+            self._complete = True
+            if self.callback_obj:
+                self.callback_obj._sounds_loaded()
+
+
+class _SoundPreload(object):
+
+    def __init__(self, loader, path):
+        self.loader = loader
+        self.path = path
+
+    def _set_buffer(self, buffer):
+        self.loader._loaded(self.path)
+
+    def _set_element(self, path):
+        _AudioPreload(self.loader, path)
+
+
+class _AudioPreload(object):
+
+    def __init__(self, loader, path):
+        self.loader = loader
+        self.path = path
+        self.sound_object = Audio(path)
+        self.handler = lambda event: self._onload(event)
+        element = self.sound_object.element
+        element.oncanplaythrough = self.handler
+        element.onerror = self.handler
+        element.preload = 'auto'
+        element.load()
+
+    def _onload(self, event):
+        element = self.sound_object.element
+        element.oncanplaythrough = None
+        element.onerror = None
+        if event.type != 'error':
+            self.loader.mixer._preloaded[self.path] = self.sound_object
+        self.loader._loaded(self.path)
+
+
+class Envelope(object):
+    """
+    Envelope object.
+    """
+
+    def __init__(self, start, duration, begin, end, curve='linear'):
+        """
+        Initialize volume envelope.
+
+        Arguments start time and duration (ms), begin and end volume multiplier, and curve 'linear' or 'exponential'.
+        Envelope is evaluated in steps precomputed from duration, at most 64 steps of at least one frame (16ms).
+        """
+        self.start = start
+        self.duration = duration
+        self.begin = begin
+        self.end = end
+        self.curve = curve
+        steps = int(duration / 16.0)
+        if steps > 64:
+            steps = 64
+        elif steps < 1:
+            steps = 1
+        self.step = duration / steps
+        self.next = start + self.step
+        if curve == 'exponential':
+            self._begin = max(begin, 0.001)
+            self._ratio = max(end, 0.001) / self._begin
+
+    def get_value(self, time):
+        """
+        Return volume multiplier at time (ms).
+        """
+        if time >= self.start + self.duration:
+            return self.end
+        t = (time - self.start) / self.duration
+        if t < 0.0:
+            t = 0.0
+        if self.curve == 'exponential':
+            return self._begin * (self._ratio ** t)
+        else:
+            return self.begin + (self.end - self.begin) * t
+
+    def is_complete(self, time):
+        """
+        Check if envelope is complete at time (ms).
+        """
+        return time >= self.start + self.duration
+
+    def shift(self, time):
+        """
+        Shift envelope by time (ms).
+        """
+        self.start += time
+        self.next += time
+        return None
+
+
 class Sound(object):
     """
     Sound object
@@ -285,6 +747,7 @@ class Sound(object):
 
     _id = 0
     _mixer = None
+    _stream = False
 
     def __init__(self, sound_file):
         """
@@ -294,14 +757,47 @@ class Sound(object):
         """
         self._id = Sound._id
         Sound._id += 1
+        self._webaudio = None
+        self._buffer = None
+        self._waiting = []
+        self._sound_object = None
+        self._sound_objects = []
         if isinstance(sound_file, str):
-            self._sound_object = Audio(sound_file.replace('\\','/'))
+            path = sound_file.replace('\\','/')
+            if self._mixer._webaudio is not None and not self._stream:
+                self._webaudio = self._mixer._webaudio
+                self._webaudio.load(path, self)
+            else:
+                self._set_element(path)
         else:
             self._sound_object = sound_file
-        self._sound_objects = []
-        self._sound_objects.append(self._sound_object)
+            self._sound_objects.append(self._sound_object)
         self._channel = None
         self._volume = 1.0
+        self._priority = 0
+        self._max_instances = 0
+        self._count = 0
+
+    def _set_element(self, path):
+        waiting = self._waiting
+        self._waiting = []
+        for channel in waiting:
+            if channel._sound is self:
+                channel.stop()
+        self._webaudio = None
+        self._sound_object = self._mixer._get_preloaded(path)
+        if self._sound_object is None:
+            self._sound_object = Audio(path)
+        self._sound_objects.append(self._sound_object)
+
+    def _set_buffer(self, buffer):
+        self._buffer = buffer
+        waiting = self._waiting
+        self._waiting = []
+        for channel in waiting:
+            if channel._sound is self and channel._active:
+                if not channel._pause:
+                    channel._webaudio_start()
 
     def play(self, loops=0, maxtime=0, fade_ms=0):
         """
@@ -310,7 +806,7 @@ class Sound(object):
         Argument loops is repeat number or -1 for continuous,
         maxtime is maximum play time, and fade_ms is fade-in time.
         """
-        self._channel = self._mixer._retrieve_channel()
+        self._channel = self._mixer._retrieve_channel(self)
         if self._channel:
             self._channel._play(self, loops, maxtime, fade_ms)
         return self._channel
@@ -319,8 +815,10 @@ class Sound(object):
         """
         Stop sound on active channels.
         """
+        if not self._count:
+            return None
         channels = self._mixer._channels
-        for id in self._mixer._channel_active:
+        for id in list(self._mixer._channel_active):
             if id > -1:
                 try:
                     if channels[id]._sound._id == self._id:
@@ -333,8 +831,10 @@ class Sound(object):
         """
         Fadeout sound on active channels in given time.
         """
+        if not self._count:
+            return None
         channels = self._mixer._channels
-        for id in self._mixer._channel_active:
+        for id in list(self._mixer._channel_active):
             if id > -1:
                 try:
                     if channels[id]._sound._id == self._id:
@@ -366,21 +866,49 @@ class Sound(object):
         """
         Get number of channels sound is active.
         """
-        channels = self._mixer._channels
-        channel = 0
-        for id in self._mixer._channel_active:
-            if id > -1:
-                try:
-                    if channels[id]._sound._id == self._id:
-                        channel += 1
-                except AttributeError:
-                    continue
-        return channel
+        return self._count
+
+    def set_priority(self, priority):
+        """
+        Set sound priority.
+
+        Argument priority is an int, default 0, higher priority sound is not stolen by lower priority sound.
+        """
+        self._priority = priority
+        return None
+
+    def get_priority(self):
+        """
+        Get sound priority.
+        """
+        return self._priority
+
+    def set_max_instances(self, count):
+        """
+        Set maximum concurrent plays of sound.
+
+        Argument count of channels, 0 for no limit.
+        When sound is playing on count channels, play stops the longest playing instance.
+        Play returns None if no instance can be stopped, such as instances on reserved channels.
+        """
+        self._max_instances = count
+        return None
+
+    def get_max_instances(self):
+        """
+        Get maximum concurrent plays of sound.
+        """
+        return self._max_instances
 
     def get_length(self):
         """
         Get length of sound sample.
         """
+        if self._webaudio is not None:
+            if self._buffer is not None:
+                return self._buffer.duration
+            else:
+                return 0.0
         return self._sound_object.getDuration()
 
     def _get_sound_object(self):
@@ -415,12 +943,17 @@ class Channel(object):
         self._rvolume = 1.0
         self._queue = None
         self._endevent = None
-        self._time = 0
         self._maxtime = 0
         self._fadein = 0
-        self._fadeout = 0
         self._dvol = 1.0
-        self._timerid = 0
+        self._envelope = None
+        self._fadeout = False
+        self._deadline = None
+        self._pausetime = 0
+        self._source = None
+        self._gain = None
+        self._start = 0.0
+        self._elapsed = 0.0
         if env.pyjs_mode.optimized:
             self._play_status = {
                 'success': lambda: self._play_success(),
@@ -440,6 +973,9 @@ class Channel(object):
 
     def _set_sound(self, sound):
         self._sound = sound
+        sound._count += 1
+        if sound._webaudio is not None:
+            return
         self._sound_object = self._sound._get_sound_object()
         self._sound_object.element.onended = self._ended_handler
 
@@ -456,17 +992,11 @@ class Channel(object):
             self._volume = volume
         self._set_sound(sound)
         self._mixer._activate_channel(self._id)
+        if self._sound._webaudio is not None:
+            self._webaudio_play(loops, maxtime, fade_ms)
+            return None
         self._loops = loops
-        if maxtime:
-            self._maxtime = maxtime / 1000.0
-            self._timerid = self._mixer._time.set_timeout(self, maxtime)
-        if fade_ms:
-            self._fadein = fade_ms / 1000.0
-            self._mixer._process(self._id)
-            self._sound_object.element.volume = 0.01
-        else:
-            self._sound_object.element.volume = (self._volume
-                                                 * self._sound._volume)
+        self._start_envelope(maxtime, fade_ms)
         promise = self._sound_object.element.play()
         if promise:
             success = self._play_status['success']
@@ -490,17 +1020,11 @@ class Channel(object):
 
     def _play(self, sound, loops, maxtime, fade_ms):
         self._set_sound(sound)
+        if self._sound._webaudio is not None:
+            self._webaudio_play(loops, maxtime, fade_ms)
+            return None
         self._loops = loops
-        if maxtime:
-            self._maxtime = maxtime / 1000.0
-            self._timerid = self._mixer._time.set_timeout(self, maxtime)
-        if fade_ms:
-            self._fadein = fade_ms / 1000.0
-            self._mixer._process(self._id)
-            self._sound_object.element.volume = 0.01
-        else:
-            self._sound_object.element.volume = (self._volume
-                                                 * self._sound._volume)
+        self._start_envelope(maxtime, fade_ms)
         promise = self._sound_object.element.play()
         if promise:
             success = self._play_status['success']
@@ -510,9 +1034,132 @@ class Channel(object):
             self._active = True
         return None
 
+    def _start_envelope(self, maxtime, fade_ms):
+        time = self._mixer._time.time()
+        if maxtime:
+            self._deadline = time + maxtime
+        if fade_ms:
+            self._envelope = Envelope(time, fade_ms, 0.0, 1.0,
+                                      self._mixer._fade_curve)
+            self._dvol = self._envelope.get_value(time)
+        else:
+            self._dvol = 1.0
+        self._sound_object.element.volume = (self._volume
+                                             * self._sound._volume
+                                             * self._dvol)
+        if maxtime or fade_ms:
+            self._mixer._schedule(self)
+
+    def _get_level(self):
+        return self._volume * self._sound._volume * self._dvol
+
+    def _get_next(self):
+        next = self._deadline
+        if self._envelope is not None:
+            if next is None or self._envelope.next < next:
+                next = self._envelope.next
+        return next
+
+    def _update(self, time):
+        if self._pause:
+            return True
+        if self._envelope is not None:
+            envelope = self._envelope
+            if time >= envelope.next:
+                self._dvol = envelope.get_value(time)
+                self._sound_object.element.volume = (self._volume
+                                                     * self._sound._volume
+                                                     * self._dvol)
+                if envelope.is_complete(time):
+                    self._envelope = None
+                    if self._fadeout:
+                        self._fadeout = False
+                        self._deadline = None
+                        self._loops = 0
+                        self._onended(None)
+                        return self._envelope is None and self._deadline is None
+                else:
+                    envelope.next = time + envelope.step
+        if self._deadline is not None:
+            if time >= self._deadline:
+                self._deadline = None
+                self._loops = 0
+                self.stop()
+        return self._envelope is None and self._deadline is None
+
+    def _webaudio_play(self, loops, maxtime, fade_ms):
+        self._loops = loops
+        self._maxtime = maxtime / 1000.0
+        self._fadein = fade_ms / 1000.0
+        self._elapsed = 0.0
+        self._active = True
+        if self._sound._buffer is not None:
+            self._webaudio_start()
+        else:
+            self._sound._waiting.append(self)
+
+    def _webaudio_start(self):
+        webaudio = self._sound._webaudio
+        context = webaudio.context
+        webaudio.resume()
+        buffer = self._sound._buffer
+        if self._gain is None:
+            self._gain = context.createGain()
+            self._gain.connect(context.destination)
+        source = context.createBufferSource()
+        source.buffer = buffer
+        source.connect(self._gain)
+        source.onended = self._ended_handler
+        now = context.currentTime
+        volume = self._volume * self._sound._volume
+        gain = self._gain.gain
+        gain.cancelScheduledValues(now)
+        if self._fadein and self._elapsed < self._fadein:
+            if self._mixer._fade_curve == 'exponential':
+                gain.setValueAtTime(max(volume * self._elapsed
+                                        / self._fadein, 0.001), now)
+                gain.exponentialRampToValueAtTime(max(volume, 0.001),
+                                        now + self._fadein - self._elapsed)
+            else:
+                gain.setValueAtTime(volume * self._elapsed / self._fadein,
+                                    now)
+                gain.linearRampToValueAtTime(volume,
+                                        now + self._fadein - self._elapsed)
+        else:
+            gain.setValueAtTime(volume, now)
+        duration = buffer.duration
+        stop = 0.0
+        if self._loops:
+            source.loop = True
+            if self._loops > 0:
+                stop = duration * (self._loops + 1) - self._elapsed
+        if self._maxtime:
+            remain = self._maxtime - self._elapsed
+            if not stop or remain < stop:
+                stop = remain
+        if duration:
+            offset = self._elapsed % duration
+        else:
+            offset = 0.0
+        source.start(now, offset)
+        if stop:
+            source.stop(now + stop)
+        self._source = source
+        self._start = now
+
+    def _webaudio_stop(self):
+        if self._source is not None:
+            self._source.onended = None
+            self._source.stop()
+            self._source.disconnect()
+            self._source = None
+        if self in self._sound._waiting:
+            self._sound._waiting.remove(self)
+
     def _replay(self):
         self._sound_object.element.volume = (self._volume
-                                             * self._sound._volume)
+                                             * self._sound._volume
+                                             * self._dvol)
         promise = self._sound_object.element.play()
         if promise:
             success = self._play_status['success']
@@ -521,56 +1168,10 @@ class Channel(object):
         else:
             self._active = True
 
-    def _process(self):
-        if self._active:
-            complete = False
-        else:
-            complete = True
-            return complete
-        self._time = self._sound_object.element.currentTime
-        complete = False
-        if self._fadein:
-            if self._time < self._fadein:
-                self._dvol = self._time / self._fadein
-                self._sound_object.element.volume = (self._volume
-                                                     * self._sound._volume
-                                                     * self._dvol)
-            else:
-                self._fadein = 0
-                complete = True
-                self._sound_object.element.volume = (self._volume
-                                                     * self._sound._volume)
-        elif self._fadeout:
-            if self._time < self._fadeout:
-                self._dvol = 1.0 - (self._time / self._fadeout)
-                self._sound_object.element.volume = (self._volume
-                                                     * self._sound._volume
-                                                     * self._dvol)
-            else:
-                self._fadeout = 0
-                complete = True
-                self._dvol = 0.01
-                self._sound_object.element.volume = (self._volume
-                                                     * self._sound._volume
-                                                     * self._dvol)
-                self._loops = 0
-                self._onended()
-        return complete
-
-    def run(self):
-        """
-        Channel processing.
-        """
-        time = self._sound_object.element.currentTime
-        if self._maxtime:
-            if time > self._maxtime:
-                self._maxtime = 0
-                self._loops = 0
-                self.stop()
-            else:
-                self._timerid = self._mixer._time.set_timeout(self, 10)
-
     def _onended(self, event):
+        if self._source is not None:
+            self._source = None
+            self._loops = 0
         if not self._loops:
             if not self._queue:
                 self.stop()
@@ -588,20 +1189,26 @@ class Channel(object):
         if self._sound:
             self._active = False
             self._mixer._deactivate_channel(self._id)
-            self._sound_object.element.onended = None
-            self._sound_object.element.pause()
-            self._sound_object.element.currentTime = 0
-            self._sound._sound_objects.append(self._sound_object)
+            if self._sound._webaudio is not None:
+                self._webaudio_stop()
+            else:
+                self._sound_object.element.onended = None
+                self._sound_object.element.pause()
+                self._sound_object.element.currentTime = 0
+                self._sound._sound_objects.append(self._sound_object)
+            self._sound._count -= 1
             self._sound = None
             self._sound_object = None
             self._queue = None
             self._pause = False
             self._loops = 0
-            if self._maxtime:
-                self._mixer._time.clear_timeout(self._timerid)
-                self._maxtime = 0
+            self._mixer._unschedule(self)
+            self._envelope = None
+            self._deadline = None
+            self._fadeout = False
+            self._dvol = 1.0
+            self._maxtime = 0
             self._fadein = 0
-            self._fadeout = 0
             self._volume = 1.0
             self._lvolume = 1.0
             self._rvolume = 1.0
@@ -616,7 +1223,15 @@ class Channel(object):
         """
         if self._sound:
             if not self._pause:
-                self._sound_object.pause()
+                if self._sound._webaudio is not None:
+                    if self._source is not None:
+                        self._elapsed += (self._sound._webaudio.get_time()
+                                          - self._start)
+                        self._webaudio_stop()
+                else:
+                    self._sound_object.pause()
+                    self._pausetime = self._mixer._time.time()
+                    self._mixer._unschedule(self)
                 self._pause = True
         return None
 
@@ -625,19 +1240,37 @@ class Channel(object):
         Unpause sound on channel.
         """
         if self._sound:
-            if self._pause:
+            if self._pause and self._sound._webaudio is not None:
+                self._pause = False
+                if self._sound._buffer is not None:
+                    self._webaudio_start()
+                else:
+                    self._sound._waiting.append(self)
+            elif self._pause:
                 promise = self._sound_object.element.play()
                 if promise:
                     success = self._unpause_status['success']
                     failed = self._unpause_status['failed']
                     JS("@{{promise}}.then(@{{success}}).catch(@{{failed}});")
                 else:
+                    self._resume_envelope()
                     self._pause = False
         return None
 
     def _unpause_success(self, res):
+        self._resume_envelope()
         self._pause = False
 
+    def _resume_envelope(self):
+        if self._envelope is None and self._deadline is None:
+            return
+        time = self._mixer._time.time() - self._pausetime
+        if self._envelope is not None:
+            self._envelope.shift(time)
+        if self._deadline is not None:
+            self._deadline += time
+        self._mixer._schedule(self)
+
     def _unpause_failed(self, err):
         error = JS("@{{err}}.name;")
         if error == 'AbortError':
@@ -650,9 +1283,31 @@ class Channel(object):
         Stop sound after fade out time.
         """
         if self._sound:
-            self._fadeout = (self._sound_object.element.currentTime
-                             + (time/1000.0))
-            self._mixer._process(self._id)
+            if self._sound._webaudio is not None:
+                if self._source is None:
+                    self.stop()
+                    return None
+                now = self._sound._webaudio.get_time()
+                gain = self._gain.gain
+                gain.cancelScheduledValues(now)
+                if self._mixer._fade_curve == 'exponential':
+                    gain.setValueAtTime(max(gain.value, 0.001), now)
+                    gain.exponentialRampToValueAtTime(0.001,
+                                                      now + (time/1000.0))
+                else:
+                    gain.setValueAtTime(gain.value, now)
+                    gain.linearRampToValueAtTime(0.0, now + (time/1000.0))
+                self._source.stop(now + (time/1000.0))
+                return None
+            if not self._pause:
+                start = self._mixer._time.time()
+            else:
+                start = self._pausetime
+            self._envelope = Envelope(start, time, self._dvol, 0.0,
+                                      self._mixer._fade_curve)
+            self._fadeout = True
+            if not self._pause:
+                self._mixer._schedule(self)
         return None
 
     def set_volume(self, volume):
@@ -667,8 +1322,15 @@ class Channel(object):
             volume = 1.0
         self._volume = volume
         if self._active:
-            self._sound_object.element.volume = (self._volume
-                                                 * self._sound._volume)
+            if self._sound._webaudio is not None:
+                if self._gain is not None:
+                    self._gain.gain.setValueAtTime(
+                        self._volume * self._sound._volume,
+                        self._sound._webaudio.get_time())
+            else:
+                self._sound_object.element.volume = (self._volume
+                                                     * self._sound._volume
+                                                     * self._dvol)
         return None
 
     def get_volume(self):
@@ -728,6 +1390,16 @@ class Channel(object):
             return Const.NOEVENT
 
 
+class MusicSound(Sound):
+    """
+    MusicSound object.
+
+    Sound streamed with Audio element regardless of mixer engine.
+    """
+
+    _stream = True
+
+
 class Music(object):
     """
     Music object.
@@ -748,7 +1420,7 @@ class Music(object):
         """
         if self._channel.get_busy():
             self._channel.stop()
-        self._sound = Sound(sound_file)
+        self._sound = MusicSound(sound_file)
         return None
 
     def unload(self):
@@ -851,9 +1523,9 @@ class Music(object):
         if not self._sound:
             return None
         if not self._channel.get_busy():
-            self._queue = Sound(sound_file)
+            self._queue = MusicSound(sound_file)
         else:
-            self._sound = Sound(sound_file)
+            self._sound = MusicSound(sound_file)
             self._channel.queue(self._sound)
 
     def set_endevent(self, eventType=None):
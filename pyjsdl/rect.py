@@ -7,6 +7,8 @@
 The module provides rect object to store coordinates.
 """
 
+from pyjsdl.pyjsarray import Int32Array
+
 
 class Rect(object):
     """
@@ -442,6 +444,63 @@ class Rect(object):
                 collided.append((rect,rects[rect]))
         return collided
 
+    def sweep(self, rect, displacement):
+        """
+        Return swept collision of this rect moved by displacement with rect.
+
+        Argument displacement is (x,y) movement of this rect, for moving rect use displacement relative to its movement.
+        Return tuple of time of impact as fraction 0.0 to 1.0 of displacement and contact normal (x,y) of rect surface, or None if no collision.
+        Rects that collide at start return time 0.0 and normal (0.0,0.0).
+        """
+        if self.intersects(rect):
+            return (0.0, (0.0, 0.0))
+        dx = displacement[0]
+        dy = displacement[1]
+        if dx > 0:
+            tx1 = (rect.x - (self.x + self.width)) / float(dx)
+            tx2 = ((rect.x + rect.width) - self.x) / float(dx)
+        elif dx < 0:
+            tx1 = ((rect.x + rect.width) - self.x) / float(dx)
+            tx2 = (rect.x - (self.x + self.width)) / float(dx)
+        elif (self.x < (rect.x + rect.width) and
+              rect.x < (self.x + self.width)):
+            tx1 = -1.0
+            tx2 = 2.0
+        else:
+            return None
+        if dy > 0:
+            ty1 = (rect.y - (self.y + self.height)) / float(dy)
+            ty2 = ((rect.y + rect.height) - self.y) / float(dy)
+        elif dy < 0:
+            ty1 = ((rect.y + rect.height) - self.y) / float(dy)
+            ty2 = (rect.y - (self.y + self.height)) / float(dy)
+        elif (self.y < (rect.y + rect.height) and
+              rect.y < (self.y + self.height)):
+            ty1 = -1.0
+            ty2 = 2.0
+        else:
+            return None
+        if tx1 > ty1:
+            t1 = tx1
+        else:
+            t1 = ty1
+        if tx2 < ty2:
+            t2 = tx2
+        else:
+            t2 = ty2
+        if t1 >= t2 or t1 < 0.0 or t1 >= 1.0:
+            return None
+        if tx1 > ty1:
+            if dx > 0:
+                return (t1, (-1.0, 0.0))
+            else:
+                return (t1, (1.0, 0.0))
+        else:
+            if dy > 0:
+                return (t1, (0.0, -1.0))
+            else:
+                return (t1, (0.0, 1.0))
+
     def _get_center(self):
         return (self.x+(self.width//2), self.y+(self.height//2))
 
@@ -582,6 +641,329 @@ class Rect(object):
     h = property(_get_h, _set_h)
 
 
+class RectArray(object):
+    """
+    RectArray object.
+    """
+
+    def __init__(self, rects=None):
+        """
+        Initialize RectArray object.
+
+        Argument rects is a list of Rect or rect-style tuples, or a size of zeroed rects.
+        Rects are packed in x, y, width, height Int32Array columns, accessed by index with get/set.
+        Batch operations test or update all rects without Rect allocation.
+        """
+        if isinstance(rects, int):
+            size = rects
+            rects = None
+        elif rects is None:
+            size = 0
+        else:
+            size = len(rects)
+        self._size = 0
+        self._alloc(size)
+        self._size = size
+        if rects:
+            for i, rect in enumerate(rects):
+                self.set(i, rect)
+
+    def _alloc(self, capacity):
+        if capacity < 8:
+            capacity = 8
+        x = Int32Array(capacity)
+        y = Int32Array(capacity)
+        width = Int32Array(capacity)
+        height = Int32Array(capacity)
+        if self._size:
+            x.set(self.x.subarray(0, self._size))
+            y.set(self.y.subarray(0, self._size))
+            width.set(self.width.subarray(0, self._size))
+            height.set(self.height.subarray(0, self._size))
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self._capacity = capacity
+        return None
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        return self.get(index)
+
+    def __setitem__(self, index, rect):
+        self.set(index, rect)
+
+    def __iter__(self):
+        return iter(self.to_rects())
+
+    def get(self, index):
+        """
+        Return Rect at index.
+        """
+        return Rect(self.x[index], self.y[index],
+                    self.width[index], self.height[index])
+
+    def set(self, index, rect):
+        """
+        Set rect at index.
+
+        Argument rect is a Rect or rect-style tuple.
+        """
+        if not isinstance(rect, Rect):
+            rect = Rect(rect)
+        self.x[index] = rect.x
+        self.y[index] = rect.y
+        self.width[index] = rect.width
+        self.height[index] = rect.height
+        return None
+
+    def append(self, rect):
+        """
+        Append rect to the array.
+        """
+        if self._size == self._capacity:
+            self._alloc(self._capacity * 2)
+        self._size += 1
+        self.set(self._size-1, rect)
+        return None
+
+    def remove(self, index):
+        """
+        Remove rect at index, replaced by last rect of the array.
+        """
+        last = self._size - 1
+        self.x[index] = self.x[last]
+        self.y[index] = self.y[last]
+        self.width[index] = self.width[last]
+        self.height[index] = self.height[last]
+        self._size = last
+        return None
+
+    def clear(self):
+        """
+        Remove all rects from the array.
+        """
+        self._size = 0
+        return None
+
+    def copy(self):
+        """
+        Return RectArray that is a copy of this rect array.
+        """
+        array = RectArray()
+        array._alloc(self._capacity)
+        array.x.set(self.x)
+        array.y.set(self.y)
+        array.width.set(self.width)
+        array.height.set(self.height)
+        array._size = self._size
+        return array
+
+    def from_rects(self, rects):
+        """
+        Set array to the list of Rect or rect-style tuples.
+        """
+        self._size = 0
+        if len(rects) > self._capacity:
+            self._alloc(len(rects))
+        self._size = len(rects)
+        for i, rect in enumerate(rects):
+            self.set(i, rect)
+        return None
+
+    def to_rects(self):
+        """
+        Return list of Rect of the array.
+        """
+        return [self.get(i) for i in range(self._size)]
+
+    def collidepoint(self, *point):
+        """
+        Return list of indices of rects that contain point.
+        """
+        if len(point) == 2:
+            px, py = point
+        else:
+            px, py = point[0]
+        x = self.x
+        y = self.y
+        width = self.width
+        height = self.height
+        collided = []
+        for i in range(self._size):
+            if (x[i] <= px < x[i] + width[i] and
+                y[i] <= py < y[i] + height[i]):
+                collided.append(i)
+        return collided
+
+    def colliderect(self, rect):
+        """
+        Return list of indices of rects that collide with rect.
+        """
+        if not isinstance(rect, Rect):
+            rect = Rect(rect)
+        rx1 = rect.x
+        ry1 = rect.y
+        rx2 = rect.x + rect.width
+        ry2 = rect.y + rect.height
+        x = self.x
+        y = self.y
+        width = self.width
+        height = self.height
+        collided = []
+        for i in range(self._size):
+            if (x[i] < rx2 and rx1 < x[i] + width[i] and
+                y[i] < ry2 and ry1 < y[i] + height[i]):
+                collided.append(i)
+        return collided
+
+    def collidelist(self, rect):
+        """
+        Return index of first rect that collide with rect, otherwise returns -1.
+        """
+        if not isinstance(rect, Rect):
+            rect = Rect(rect)
+        rx1 = rect.x
+        ry1 = rect.y
+        rx2 = rect.x + rect.width
+        ry2 = rect.y + rect.height
+        x = self.x
+        y = self.y
+        width = self.width
+        height = self.height
+        for i in range(self._size):
+            if (x[i] < rx2 and rx1 < x[i] + width[i] and
+                y[i] < ry2 and ry1 < y[i] + height[i]):
+                return i
+        return -1
+
+    def collidelistall(self, rects):
+        """
+        Return list of (index, rects index) pairs of rects that collide with rects.
+
+        Argument rects is a RectArray or a list of Rect.
+        """
+        if not isinstance(rects, RectArray):
+            rects = RectArray(rects)
+        x = self.x
+        y = self.y
+        width = self.width
+        height = self.height
+        collided = []
+        for j in range(len(rects)):
+            rx1 = rects.x[j]
+            ry1 = rects.y[j]
+            rx2 = rx1 + rects.width[j]
+            ry2 = ry1 + rects.height[j]
+            for i in range(self._size):
+                if (x[i] < rx2 and rx1 < x[i] + width[i] and
+                    y[i] < ry2 and ry1 < y[i] + height[i]):
+                    collided.append((i, j))
+        return collided
+
+    def clip(self, rect):
+        """
+        Return RectArray representing rects clipped by rect.
+        """
+        array = self.copy()
+        array.clip_ip(rect)
+        return array
+
+    def clip_ip(self, rect):
+        """
+        Clip rects of this array by rect.
+
+        Rects not intersecting rect are set to (0,0,0,0).
+        """
+        if not isinstance(rect, Rect):
+            rect = Rect(rect)
+        rx1 = rect.x
+        ry1 = rect.y
+        rx2 = rect.x + rect.width
+        ry2 = rect.y + rect.height
+        x = self.x
+        y = self.y
+        width = self.width
+        height = self.height
+        for i in range(self._size):
+            x1 = x[i]
+            y1 = y[i]
+            x2 = x1 + width[i]
+            y2 = y1 + height[i]
+            if x1 < rx2 and rx1 < x2 and y1 < ry2 and ry1 < y2:
+                if x1 < rx1:
+                    x1 = rx1
+                if y1 < ry1:
+                    y1 = ry1
+                if x2 > rx2:
+                    x2 = rx2
+                if y2 > ry2:
+                    y2 = ry2
+                x[i] = x1
+                y[i] = y1
+                width[i] = x2 - x1
+                height[i] = y2 - y1
+            else:
+                x[i] = 0
+                y[i] = 0
+                width[i] = 0
+                height[i] = 0
+        return None
+
+    def union(self):
+        """
+        Return Rect representing the union of rects of the array.
+        """
+        if not self._size:
+            return Rect(0,0,0,0)
+        x = self.x
+        y = self.y
+        width = self.width
+        height = self.height
+        x1 = x[0]
+        y1 = y[0]
+        x2 = x1 + width[0]
+        y2 = y1 + height[0]
+        for i in range(1, self._size):
+            if x[i] < x1:
+                x1 = x[i]
+            if y[i] < y1:
+                y1 = y[i]
+            rx2 = x[i] + width[i]
+            if rx2 > x2:
+                x2 = rx2
+            ry2 = y[i] + height[i]
+            if ry2 > y2:
+                y2 = ry2
+        return Rect(x1, y1, x2-x1, y2-y1)
+
+    def move(self, *offset):
+        """
+        Return RectArray of rects offset by x,y.
+        """
+        array = self.copy()
+        array.move_ip(*offset)
+        return array
+
+    def move_ip(self, *offset):
+        """
+        Move rects of this array offset by x,y.
+        """
+        if len(offset) == 2:
+            dx, dy = offset
+        else:
+            dx, dy = offset[0]
+        x = self.x
+        y = self.y
+        for i in range(self._size):
+            x[i] = x[i] + dx
+            y[i] = y[i] + dy
+        return None
+
+
 class RectPool(list):
     """
     RectPool object.
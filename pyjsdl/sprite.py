@@ -8,7 +8,9 @@ The module provides sprite object functionality.
 """
 
 from pyjsdl.rect import rectPool
+from pyjsdl.vector import Vector2
 from pyjsdl import mask
+from pyjsdl import env
 import sys
 
 if sys.version_info < (3,):
@@ -27,6 +29,7 @@ class Sprite(object):
     """
 
     _identity = 0
+    _shape = None
 
     def __init__(self, *groups):
         """
@@ -132,10 +135,14 @@ class Group(object):
         self._identity = Group._identity
         Group._identity += 1
         self._sprites = dict()
+        self._spatial = None
+        self._tracked = None
+        self._visible = []
         if sprites:
             self.add(*sprites)
         self._clear_active = False
         self._sprites_drawn = dict()
+        self._culled = 0
 
     def __str__(self):
         s = '<%s(%d sprites)>'
@@ -177,6 +184,8 @@ class Group(object):
                 if spriteID not in self._sprites:
                     self._sprites[spriteID] = sprite
                     sprite._groups[id(self)] = self
+                    if self._spatial is not None:
+                        self._spatial.add(sprite)
             else:
                 self.add(*sprite)
         return None
@@ -191,6 +200,8 @@ class Group(object):
                 if spriteID in self._sprites:
                     del self._sprites[spriteID]
                     del sprite._groups[id(self)]
+                    if self._spatial is not None:
+                        self._spatial.remove(sprite)
             else:
                 self.remove(*sprite)
         return None
@@ -208,19 +219,89 @@ class Group(object):
                     return False
         return True
 
-    def draw(self, surface):
+    def draw(self, surface, viewport=None, camera=None):
         """
         Draw sprite on surface.
+
+        Optional viewport rect culls sprites with image outside viewport, image bounds at rect position.
+        Viewport of surface rect culls sprites outside surface, using spatial index if set.
+        Optional camera draws sprites offset by camera position and scaled by camera zoom, culling sprites outside camera view, with viewport in world coordinates.
         """
-        surface._blits([(sprite.image,sprite.rect) for sprite in self])
+        profiler = env.profiler
+        if profiler is not None:
+            profiler.start('draw')
+        sprites = self._get_visible(surface, viewport, camera)
+        if camera is None:
+            surface._blits(sprites)
+        else:
+            surface._blits(sprites, (camera.x,camera.y), camera.zoom)
         if self._clear_active:
             rectPool.extend(self._sprites_drawn.values())
             self._sprites_drawn.clear()
-            for sprite in self._sprites:
-                self._sprites_drawn[sprite] = rectPool.copy(
-                                 self._sprites[sprite].rect)
+            for sprite in sprites:
+                self._sprites_drawn[id(sprite)] = _screen_rect(sprite.rect,
+                                                               camera)
+        if profiler is not None:
+            profiler.stop('draw')
         return None
 
+    def _get_visible(self, surface, viewport, camera=None):
+        sprites = self._visible
+        size = len(sprites)
+        count = 0
+        if camera is None and viewport is None:
+            for sprite in self:
+                if count < size:
+                    sprites[count] = sprite
+                else:
+                    sprites.append(sprite)
+                count += 1
+            while len(sprites) > count:
+                sprites.pop()
+            self._culled = 0
+            return sprites
+        if camera is not None:
+            view = camera._get_view(surface)
+            if viewport is not None:
+                viewport = view.clip(viewport)
+                rectPool.append(view)
+                view = viewport
+        else:
+            view = rectPool.copy(viewport)
+        x1 = view.x
+        y1 = view.y
+        x2 = view.x + view.width
+        y2 = view.y + view.height
+        if self._spatial is not None:
+            #index holds rects, query extended by image extent beyond rects
+            dx, dy = self._spatial._extent
+            area = rectPool.get(x1-dx, y1-dy, view.width+dx, view.height+dy)
+            candidates = self._sort_sprites(self._spatial.query_rect(area))
+            rectPool.append(area)
+        else:
+            candidates = self
+        for sprite in candidates:
+            rect = sprite.rect
+            image = sprite.image
+            if (rect.x < x2 and x1 < rect.x + image.width and
+                rect.y < y2 and y1 < rect.y + image.height):
+                if count < size:
+                    sprites[count] = sprite
+                else:
+                    sprites.append(sprite)
+                count += 1
+        while len(sprites) > count:
+            sprites.pop()
+        rectPool.append(view)
+        self._culled = len(self._sprites) - len(sprites)
+        return sprites
+
+    def get_culled(self):
+        """
+        Return count of sprites culled at last draw.
+        """
+        return self._culled
+
     def clear(self, surface, background):
         """
         Clear previous sprite drawn to surface
@@ -242,6 +323,8 @@ class Group(object):
         for sprite in self._sprites.values():
             del sprite._groups[id(self)]
         self._sprites.clear()
+        if self._spatial is not None:
+            self._spatial.clear()
         return None
 
     def update(self, *args):
@@ -249,9 +332,107 @@ class Group(object):
         Group update.
 
         Update sprites in group by calling sprite.update.
+        With rect tracking, sprite rects are stored as previous rects before update.
+        With spatial index, the index is updated with sprite rect changes after update.
         """
+        if self._tracked is not None:
+            self.track_rects()
         for sprite in self._sprites.values():
             sprite.update(*args)
+        if self._spatial is not None:
+            self._spatial.update(self._sprites.values())
+        return None
+
+    def track_rects(self):
+        """
+        Track sprite rects.
+
+        Store current rect of group sprites as previous rect, used by sweepcollide as start of sprite movement.
+        Once called, group update also stores rects before updating sprites, otherwise call before sprite movement each step.
+        """
+        if self._tracked is None:
+            self._tracked = {}
+        tracked = self._tracked
+        for spriteID in self._sprites:
+            rect = self._sprites[spriteID].rect
+            if spriteID in tracked:
+                tracked[spriteID].setLocation(rect.x, rect.y)
+                tracked[spriteID].setSize(rect.width, rect.height)
+            else:
+                tracked[spriteID] = rectPool.copy(rect)
+        if len(tracked) > len(self._sprites):
+            for spriteID in [_id for _id in tracked
+                             if _id not in self._sprites]:
+                rectPool.append(tracked.pop(spriteID))
+        return None
+
+    def get_previous_rect(self, sprite):
+        """
+        Return previous rect of sprite stored with rect tracking, or current rect if not tracked.
+        """
+        if self._tracked is not None and id(sprite) in self._tracked:
+            return self._tracked[id(sprite)]
+        return sprite.rect
+
+    def set_spatial_index(self, cellsize=64):
+        """
+        Set spatial index.
+
+        Argument cellsize is the grid cell size of a SpriteGrid index of group sprites, None to remove index.
+        The index serves sprite position queries, and is updated with sprite rect changes at group update.
+        """
+        if cellsize:
+            self._spatial = SpriteGrid(cellsize)
+            for sprite in self._sprites.values():
+                self._spatial.add(sprite)
+        else:
+            self._spatial = None
+        return None
+
+    def get_spatial_index(self):
+        """
+        Return spatial index, or None if not set.
+        """
+        return self._spatial
+
+    def update_spatial_index(self, sprite=None):
+        """
+        Update spatial index with rect change of sprite, or of all group sprites if not specified.
+
+        Group update updates the index, required for sprites moved otherwise before group queries.
+        """
+        if self._spatial is not None:
+            if sprite is None:
+                self._spatial.update(self._sprites.values())
+            else:
+                self._spatial.update((sprite,))
+        return None
+
+    def _sort_sprites(self, sprites):
+        return sprites
+
+    def get_sprites_in(self, rect):
+        """
+        Return sprites that collide with rect.
+        """
+        spatial = self._spatial
+        if spatial is not None:
+            return self._sort_sprites(spatial.query_rect(rect))
+        return [sprite for sprite in self if sprite.rect.colliderect(rect)]
+
+    def get_nearest_sprite(self, position, distance=None):
+        """
+        Return sprite with rect nearest to position.
+
+        Optional distance limits search, returns None if no sprite within distance.
+        """
+        spatial = self._spatial
+        if spatial is not None:
+            sprites = spatial.query_nearest(position, distance)
+        else:
+            sprites = _nearest(self, position, distance)
+        if sprites:
+            return self._sort_sprites(sprites)[0]
         return None
 
 
@@ -299,6 +480,8 @@ class GroupSingle(Group):
         self.empty()
         self._sprites[id(sprite)] = sprite
         sprite._groups[id(self)] = self
+        if self._spatial is not None:
+            self._spatial.add(sprite)
         return None
 
     @property
@@ -328,43 +511,149 @@ class RenderUpdates(Group):
 
         Group subsclass that provides dirty draw functions.
         Can optionally be called with sprite(s) to add.
+        Drawn sprite rects are retained in slots of preallocated lists,
+        and changed areas reuse Rect objects between draws.
         """
         Group.__init__(self, *sprites)
         self.changed_areas = []
+        self._changed = 0
+        self._slot = dict()
+        self._slot_id = []
+        self._slot_rect = []
+        self._slot_frame = []
+        self._slot_free = []
+        self._slot_drawn = []
+        self._frame = 0
 
-    def draw(self, surface):
+    def draw(self, surface, viewport=None, camera=None):
         """
         Draw sprite on surface.
 
-        Returns list of Rect of sprites updated, which can be passed to display.update.
-        """
-        surface._blits([(sprite.image,sprite.rect) for sprite in self])
+        Optional viewport rect culls sprites with image outside viewport, image bounds at rect position.
+        Viewport of surface rect culls sprites outside surface, using spatial index if set.
+        Optional camera draws sprites offset by camera position and scaled by camera zoom, culling sprites outside camera view, with viewport in world coordinates.
+        Returns list of Rect in surface coordinates of sprites updated, which can be passed to display.update.
+        The list and its Rect objects are reused at next draw.
+        """
+        profiler = env.profiler
+        if profiler is not None:
+            profiler.start('draw')
+        sprites = self._get_visible(surface, viewport, camera)
+        if camera is None:
+            surface._blits(sprites)
+            cx = 0
+            cy = 0
+            zoom = 1
+        else:
+            surface._blits(sprites, (camera.x,camera.y), camera.zoom)
+            cx = camera.x
+            cy = camera.y
+            zoom = camera.zoom
+        self._changed = 0
         if self._clear_active:
-            rectPool.extend(self.changed_areas)
-            self.changed_areas[:] = []
-            for sprite in self._sprites:
-                if sprite in self._sprites_drawn:
-                    if self._sprites_drawn[sprite].intersects(
-                                   self._sprites[sprite].rect):
-                        self._sprites_drawn[sprite].union_ip(
-                                  self._sprites[sprite].rect)
+            self._frame += 1
+            frame = self._frame
+            drawn = self._slot_drawn
+            size = len(drawn)
+            count = 0
+            for sprite in sprites:
+                rect = sprite.rect
+                x = (rect.x - cx) * zoom
+                y = (rect.y - cy) * zoom
+                w = rect.width * zoom
+                h = rect.height * zoom
+                spriteID = id(sprite)
+                if spriteID in self._slot:
+                    slot = self._slot[spriteID]
+                    r = self._slot_rect[slot]
+                    if (r.x < x + w and x < r.x + r.width and
+                        r.y < y + h and y < r.y + r.height):
+                        x1 = r.x if r.x < x else x
+                        y1 = r.y if r.y < y else y
+                        x2 = r.x + r.width
+                        if x + w > x2:
+                            x2 = x + w
+                        y2 = r.y + r.height
+                        if y + h > y2:
+                            y2 = y + h
+                        self._add_changed(x1, y1, x2-x1, y2-y1)
                     else:
-                        self.changed_areas.append(
-                            rectPool.copy(self._sprites[sprite].rect))
+                        self._add_changed(x, y, w, h)
+                        self._add_changed(r.x, r.y, r.width, r.height)
                 else:
-                    self.changed_areas.append(
-                        rectPool.copy(self._sprites[sprite].rect))
-            self.changed_areas.extend(self._sprites_drawn.values())
-            self._sprites_drawn.clear()
-            for sprite in self._sprites:
-                self._sprites_drawn[sprite] = rectPool.copy(
-                                 self._sprites[sprite].rect)
+                    slot = self._get_slot(spriteID)
+                    r = self._slot_rect[slot]
+                    self._add_changed(x, y, w, h)
+                r.x = x
+                r.y = y
+                r.width = w
+                r.height = h
+                self._slot_frame[slot] = frame
+                if count < size:
+                    drawn[count] = r
+                else:
+                    drawn.append(r)
+                count += 1
+            while len(drawn) > count:
+                drawn.pop()
+            slot_id = self._slot_id
+            for slot in range(len(slot_id)):
+                spriteID = slot_id[slot]
+                if spriteID is not None and self._slot_frame[slot] != frame:
+                    r = self._slot_rect[slot]
+                    self._add_changed(r.x, r.y, r.width, r.height)
+                    del self._slot[spriteID]
+                    slot_id[slot] = None
+                    self._slot_free.append(slot)
         else:
-            rectPool.extend(self.changed_areas)
-            self.changed_areas[:] = []
-            self.changed_areas.extend([rectPool.copy(sprite.rect)
-                                       for sprite in self._sprites.values()])
-        return self.changed_areas
+            for sprite in sprites:
+                rect = sprite.rect
+                self._add_changed((rect.x - cx) * zoom, (rect.y - cy) * zoom,
+                                  rect.width * zoom, rect.height * zoom)
+        changed = self.changed_areas
+        while len(changed) > self._changed:
+            rectPool.append(changed.pop())
+        if profiler is not None:
+            profiler.stop('draw')
+        return changed
+
+    def _add_changed(self, x, y, width, height):
+        changed = self.changed_areas
+        if self._changed < len(changed):
+            rect = changed[self._changed]
+            rect.x = x
+            rect.y = y
+            rect.width = width
+            rect.height = height
+        else:
+            changed.append(rectPool.get(x, y, width, height))
+        self._changed += 1
+
+    def _get_slot(self, spriteID):
+        if self._slot_free:
+            slot = self._slot_free.pop()
+            self._slot_id[slot] = spriteID
+        else:
+            slot = len(self._slot_id)
+            self._slot_id.append(spriteID)
+            self._slot_rect.append(rectPool.get(0, 0, 0, 0))
+            self._slot_frame.append(0)
+        self._slot[spriteID] = slot
+        return slot
+
+    def clear(self, surface, background):
+        """
+        Clear previous sprite drawn to surface
+
+        Uses the background surface to clear.
+        The background argument can be a callback function.
+        """
+        self._clear_active = True
+        if hasattr(background, 'width'):
+            surface._blit_clear(background, self._slot_drawn)
+        else:
+            for rect in self._slot_drawn:
+                background(surface, rect)
 
 
 class OrderedUpdates(RenderUpdates):
@@ -377,28 +666,38 @@ class OrderedUpdates(RenderUpdates):
         Initialize OrderedUpdates object.
 
         RenderUpdates subclass that maintains order of sprites.
+        Sprites are held in indexed slots, removal leaves an empty slot
+        that is compacted at next ordered access.
         Can optionally be called with sprite(s) to add.
         """
-        self._orderedsprites = []
+        self._orderedsprites = _SpriteList()
         RenderUpdates.__init__(self, *sprites)
 
     def __iter__(self):
-        return iter(self._orderedsprites)
+        return iter(self._get_ordered())
 
     def sprites(self):
         """
         Return ordered list of sprites in the group.
         """
-        return self._orderedsprites[:]
+        return self._orderedsprites.items()[:]
 
     def copy(self):
         """
         Return copy of group.
         """
         newgroup = RenderUpdates.copy(self)
-        newgroup._orderedsprites = self._orderedsprites[:]
+        newgroup._orderedsprites = self._orderedsprites.copy()
         return newgroup
 
+    def _get_ordered(self):
+        return self._orderedsprites.sprites()
+
+    def _sort_sprites(self, sprites):
+        index = self._orderedsprites._index
+        sprites.sort(key=lambda sprite: index[id(sprite)])
+        return sprites
+
     def add(self, *sprites):
         """
         Add sprite(s) to group.
@@ -412,6 +711,8 @@ class OrderedUpdates(RenderUpdates):
                     self._sprites[spriteID] = sprite
                     sprite._groups[id(self)] = self
                     self._orderedsprites.append(sprite)
+                    if self._spatial is not None:
+                        self._spatial.add(sprite)
             else:
                 self.add(*sprite)
         return None
@@ -427,6 +728,8 @@ class OrderedUpdates(RenderUpdates):
                     del self._sprites[spriteID]
                     del sprite._groups[id(self)]
                     self._orderedsprites.remove(sprite)
+                    if self._spatial is not None:
+                        self._spatial.remove(sprite)
             else:
                 self.remove(*sprite)
         return None
@@ -435,10 +738,123 @@ class OrderedUpdates(RenderUpdates):
         """
         Empty group.
         """
-        self._orderedsprites[:] = []
+        self._orderedsprites.clear()
         RenderUpdates.empty(self)
 
 
+class SortedUpdates(OrderedUpdates):
+    """
+    SortedUpdates object.
+    """
+
+    def __init__(self, *sprites, **kwargs):
+        """
+        Initialize SortedUpdates object.
+
+        OrderedUpdates subclass that draws sprites in order of a sort key.
+        Optional key keyword argument is a function of sprite or a sprite attribute name that returns the key, defaults to sprite rect bottom.
+        Sprite order is retained between draws and re-sorted with insertion sort when few sprites moved, otherwise with a full sort.
+        Can optionally be called with sprite(s) to add.
+        """
+        self._keys = []
+        self.set_key(kwargs.get('key'))
+        OrderedUpdates.__init__(self, *sprites)
+
+    def set_key(self, key=None):
+        """
+        Set sort key.
+
+        Argument key is a function of sprite or a sprite attribute name, None for sprite rect bottom.
+        """
+        if key is None:
+            self._key = lambda sprite: sprite.rect.y + sprite.rect.height
+        elif isinstance(key, str):
+            self._key = lambda sprite: getattr(sprite, key)
+        else:
+            self._key = key
+        self._keyarg = key
+        return None
+
+    def get_key(self):
+        """
+        Return sort key.
+        """
+        return self._keyarg
+
+    def copy(self):
+        """
+        Return copy of group.
+        """
+        newgroup = OrderedUpdates.copy(self)
+        newgroup.set_key(self._keyarg)
+        return newgroup
+
+    def sort(self):
+        """
+        Sort sprites by key.
+
+        Called at draw, sorting is incremental when sprite order changed little since last sort.
+        """
+        sprites = self._orderedsprites.items()
+        keys = self._keys
+        key = self._key
+        size = len(sprites)
+        if len(keys) != size:
+            keys[:] = [0 for i in range(size)]
+        unsorted = 0
+        for i in range(size):
+            keys[i] = key(sprites[i])
+            if i and keys[i] < keys[i-1]:
+                unsorted += 1
+        if not unsorted:
+            return None
+        self._orderedsprites.unshare()
+        sprites = self._orderedsprites.items()
+        if unsorted * 8 > size or not self._insertion_sort(sprites, size):
+            sprites.sort(key=key)
+            for i in range(size):
+                keys[i] = key(sprites[i])
+            self._orderedsprites.reindex(0)
+        return None
+
+    def _insertion_sort(self, sprites, size):
+        keys = self._keys
+        limit = size * 2
+        shifts = 0
+        start = size
+        for i in range(1, size):
+            k = keys[i]
+            if k >= keys[i-1]:
+                continue
+            sprite = sprites[i]
+            j = i - 1
+            while j >= 0 and keys[j] > k:
+                keys[j+1] = keys[j]
+                sprites[j+1] = sprites[j]
+                j -= 1
+            keys[j+1] = k
+            sprites[j+1] = sprite
+            if j+1 < start:
+                start = j+1
+            shifts += i - j
+            if shifts > limit:
+                return False
+        self._orderedsprites.reindex(start)
+        return True
+
+    def draw(self, surface, viewport=None, camera=None):
+        """
+        Draw sprite on surface in order of sort key.
+
+        Optional viewport rect culls sprites with image outside viewport, image bounds at rect position.
+        Viewport of surface rect culls sprites outside surface, using spatial index if set.
+        Optional camera draws sprites offset by camera position and scaled by camera zoom, culling sprites outside camera view, with viewport in world coordinates.
+        Returns list of Rect in surface coordinates of sprites updated, which can be passed to display.update.
+        """
+        self.sort()
+        return OrderedUpdates.draw(self, surface, viewport, camera)
+
+
 class LayeredUpdates(OrderedUpdates):
     """
     LayeredUpdates object.
@@ -455,9 +871,14 @@ class LayeredUpdates(OrderedUpdates):
         as default, otherwise default_layer will be 0.
         If provided a layer keyword argument, then sprites will be
         added to that layer regardless of the sprite _layer attribute.
+        Sprites are held in per-layer buckets with a sorted layer index,
+        and draw order is produced by concatenating buckets.
         """
         self._layer = {}
         self._layers = []
+        self._sprite_layer = dict()
+        self._ordercache = []
+        self._ordered = True
         if 'default_layer' not in kwargs:
             self._default_layer = 0
         else:
@@ -468,19 +889,25 @@ class LayeredUpdates(OrderedUpdates):
             self._override_layer = kwargs['layer']
         OrderedUpdates.__init__(self, *sprites)
 
+    def __iter__(self):
+        return iter(self._get_ordered())
+
+    def sprites(self):
+        """
+        Return ordered list of sprites in the group.
+        """
+        return self._get_ordered()[:]
+
     def copy(self):
         """
         Return copy of group.
         """
-        newgroup = OrderedUpdates.copy(self)
-        for layer in self._layer:
-            layer_data = {}
-            layer_data['sprite'] = set()
-            for spriteID in self._layer[layer]['sprite']:
-                layer_data['sprite'].add(spriteID)
-            layer_data['index'] = self._layer[layer]['index'][:]
-            newgroup._layer[layer] = layer_data
+        newgroup = RenderUpdates.copy(self)
+        for layer in self._layers:
+            newgroup._layer[layer] = self._layer[layer].copy()
         newgroup._layers = self._layers[:]
+        newgroup._sprite_layer = self._sprite_layer.copy()
+        newgroup._ordered = False
         newgroup._default_layer = self._default_layer
         return newgroup
 
@@ -506,17 +933,9 @@ class LayeredUpdates(OrderedUpdates):
                         layer = sprite._layer
                     else:
                         layer = self._default_layer
-                    if layer not in self._layer:
-                        self._add_layer(layer)
-                    self._layer[layer]['sprite'].add(spriteID)
-                    i = self._layer[layer]['index'][1]
-                    self._layer[layer]['index'][1] += 1
-                    index = self._layers.index(layer)
-                    if self._layers[index:]:
-                        for _layer in self._layers[index+1:]:
-                            self._layer[_layer]['index'][0] += 1
-                            self._layer[_layer]['index'][1] += 1
-                    self._orderedsprites.insert(i, sprite)
+                    self._add_sprite(sprite, layer)
+                    if self._spatial is not None:
+                        self._spatial.add(sprite)
             else:
                 if self._override_layer is not None:
                     kwargs['layer'] = self._override_layer
@@ -524,16 +943,61 @@ class LayeredUpdates(OrderedUpdates):
         self._override_layer = None
         return None
 
+    def _add_sprite(self, sprite, layer):
+        if layer not in self._layer:
+            self._add_layer(layer)
+        self._layer[layer].append(sprite)
+        self._sprite_layer[id(sprite)] = layer
+        self._ordered = False
+
+    def _remove_sprite(self, sprite):
+        layer = self._sprite_layer.pop(id(sprite))
+        bucket = self._layer[layer]
+        bucket.remove(sprite)
+        if not len(bucket):
+            self._remove_layer(layer)
+        self._ordered = False
+        return layer
+
     def _add_layer(self, layer):
-        self._layers.append(layer)
-        self._layers.sort()
-        index = self._layers.index(layer)
-        if self._layers[:index]:
-            prelayer = self._layers[index-1]
-            i = self._layer[prelayer]['index'][1]
-        else:
-            i = 0
-        self._layer[layer] = {'sprite':set(), 'index':[i,i]}
+        lo = 0
+        hi = len(self._layers)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._layers[mid] < layer:
+                lo = mid + 1
+            else:
+                hi = mid
+        self._layers.insert(lo, layer)
+        self._layer[layer] = _SpriteList()
+
+    def _remove_layer(self, layer):
+        lo = 0
+        hi = len(self._layers)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._layers[mid] < layer:
+                lo = mid + 1
+            else:
+                hi = mid
+        del self._layers[lo]
+        del self._layer[layer]
+
+    def _get_ordered(self):
+        if not self._ordered:
+            ordered = []
+            for layer in self._layers:
+                ordered.extend(self._layer[layer].items())
+            self._ordercache = ordered
+            self._ordered = True
+        return self._ordercache
+
+    def _sort_sprites(self, sprites):
+        layers = self._sprite_layer
+        buckets = self._layer
+        sprites.sort(key=lambda sprite: (layers[id(sprite)],
+                         buckets[layers[id(sprite)]]._index[id(sprite)]))
+        return sprites
 
     def remove(self, *sprites):
         """
@@ -545,22 +1009,9 @@ class LayeredUpdates(OrderedUpdates):
                 if spriteID in self._sprites:
                     del self._sprites[spriteID]
                     del sprite._groups[id(self)]
-                    for layer in self._layers:
-                        if str(spriteID) in self._layer[layer]['sprite']:
-                            break
-                    self._layer[layer]['sprite'].remove(spriteID)
-                    i = self._layer[layer]['index'][1]
-                    self._layer[layer]['index'][1] -= 1
-                    index = self._layers.index(layer)
-                    if self._layers[index:]:
-                        for _layer in self._layers[index+1:]:
-                            self._layer[_layer]['index'][0] -= 1
-                            self._layer[_layer]['index'][1] -= 1
-                    if (self._layer[layer]['index'][0]
-                            == self._layer[layer]['index'][1]):
-                        del self._layer[layer]
-                        self._layers.remove(layer)
-                    self._orderedsprites.remove(sprite)
+                    self._remove_sprite(sprite)
+                    if self._spatial is not None:
+                        self._spatial.remove(sprite)
             else:
                 self.remove(*sprite)
         return None
@@ -571,14 +1022,22 @@ class LayeredUpdates(OrderedUpdates):
         """
         self._layers[:] = []
         self._layer.clear()
+        self._sprite_layer.clear()
+        self._ordercache = []
+        self._ordered = True
         OrderedUpdates.empty(self)
 
     def get_sprites_at(self, position):
         """
         Return sprites at position.
+
+        Sprites are returned in layer order, using spatial index if set.
         """
+        spatial = self._spatial
+        if spatial is not None:
+            return self._sort_sprites(spatial.query_point(position))
         colliding_sprites = []
-        for sprite in self._orderedsprites:
+        for sprite in self._get_ordered():
             if sprite.rect.collidepoint(position):
                 colliding_sprites.append(sprite)
         return colliding_sprites
@@ -587,14 +1046,15 @@ class LayeredUpdates(OrderedUpdates):
         """
         Return sprite at sprites index.
         """
-        return self._orderedsprites[index]
+        return self._get_ordered()[index]
 
     def remove_sprites_of_layer(self, layer):
         """
         Return sprites removed from layer.
         """
-        i,j = self._layer[layer]['index']
-        sprites = self._orderedsprites[i:j]
+        if layer not in self._layer:
+            return []
+        sprites = self._layer[layer].items()[:]
         for sprite in sprites:
             self.remove(sprite)
         return sprites
@@ -609,17 +1069,19 @@ class LayeredUpdates(OrderedUpdates):
         """
         Move sprite to new layer.
         """
-        self.remove(sprite)
-        self.add(sprite, layer=new_layer)
+        if id(sprite) in self._sprite_layer:
+            self._remove_sprite(sprite)
+            self._add_sprite(sprite, new_layer)
         return None
 
     def get_layer_of_sprite(self, sprite):
         """
         Return layer of sprite.
         """
-        for layer in self._layers:
-            if str(id(sprite)) in self._layer[layer]['sprite']:
-                return layer
+        spriteID = id(sprite)
+        if spriteID in self._sprite_layer:
+            return self._sprite_layer[spriteID]
+        return None
 
     def get_top_layer(self):
         """
@@ -637,40 +1099,273 @@ class LayeredUpdates(OrderedUpdates):
         """
         Move sprite to top layer.
         """
-        self.remove(sprite)
-        self.add(sprite, layer=self._layers[-1])
+        self.change_layer(sprite, self._layers[-1])
         return None
 
     def move_to_back(self, sprite):
         """
         Move sprite to layer under bottom layer.
         """
-        new_layer = self._layers[0]-1
-        self.remove(sprite)
-        self.add(sprite, layer=new_layer)
+        self.change_layer(sprite, self._layers[0]-1)
         return None
 
     def get_top_sprite(self):
         """
         Return sprite at top.
         """
-        return self._orderedsprites[-1]
+        return self._get_ordered()[-1]
 
     def get_sprites_from_layer(self, layer):
         """
         Return sprites on layer.
         """
-        i,j = self._layer[layer]['index']
-        return self._orderedsprites[i:j]
+        if layer not in self._layer:
+            return []
+        return self._layer[layer].items()[:]
 
     def switch_layer(self, layer1, layer2):
         """
         Move sprites to new layer.
         """
-        sprites1 = self.remove_sprites_of_layer(layer1)
-        sprites2 = self.remove_sprites_of_layer(layer2)
-        self.add(sprites1, layer=layer2)
-        self.add(sprites2, layer=layer1)
+        sprites1 = self.get_sprites_from_layer(layer1)
+        sprites2 = self.get_sprites_from_layer(layer2)
+        for sprite in sprites1:
+            self._remove_sprite(sprite)
+        for sprite in sprites2:
+            self._remove_sprite(sprite)
+        for sprite in sprites1:
+            self._add_sprite(sprite, layer2)
+        for sprite in sprites2:
+            self._add_sprite(sprite, layer1)
+
+
+class _SpriteList(object):
+
+    def __init__(self):
+        self._items = []
+        self._index = dict()
+        self._removed = 0
+        self._shared = False
+
+    def __len__(self):
+        return len(self._index)
+
+    def append(self, sprite):
+        self._index[id(sprite)] = len(self._items)
+        self._items.append(sprite)
+
+    def remove(self, sprite):
+        i = self._index.pop(id(sprite))
+        self.unshare()
+        self._items[i] = None
+        self._removed += 1
+        if not self._index:
+            self.clear()
+        elif self._removed > 32 and self._removed > len(self._index):
+            self._compact()
+
+    def clear(self):
+        self._items = []
+        self._index.clear()
+        self._removed = 0
+        self._shared = False
+
+    def sprites(self):
+        if self._removed:
+            self._compact()
+        self._shared = True
+        return self._items
+
+    def items(self):
+        if self._removed:
+            self._compact()
+        return self._items
+
+    def unshare(self):
+        if self._shared:
+            self._items = self._items[:]
+            self._shared = False
+
+    def copy(self):
+        spritelist = _SpriteList()
+        for sprite in self.items():
+            spritelist.append(sprite)
+        return spritelist
+
+    def reindex(self, start):
+        items = self._items
+        for i in range(start, len(items)):
+            self._index[id(items[i])] = i
+
+    def _compact(self):
+        items = []
+        for sprite in self._items:
+            if sprite is not None:
+                self._index[id(sprite)] = len(items)
+                items.append(sprite)
+        self._items = items
+        self._removed = 0
+        self._shared = False
+
+
+class RetainedUpdates(LayeredUpdates):
+    """
+    RetainedUpdates object.
+    """
+
+    def __init__(self, *sprites, **kwargs):
+        """
+        Initialize RetainedUpdates object.
+
+        LayeredUpdates subclass that retains last drawn image, position, alpha and layer of sprites,
+        and at draw_retained redraws only changed sprites and sprites overlapping the changed areas, in layer order.
+        The background is restored in changed areas, set with set_background or draw_retained.
+        Methods draw and clear draw all sprites as LayeredUpdates, follow with repaint to resume draw_retained.
+        Arguments are the same as LayeredUpdates.
+        """
+        self._drawstate = dict()
+        self._stale = []
+        self._redraw = []
+        self._repaint = []
+        self._background = None
+        LayeredUpdates.__init__(self, *sprites, **kwargs)
+
+    def set_background(self, background):
+        """
+        Set background surface used to restore changed areas at draw_retained.
+        """
+        self._background = background
+        return None
+
+    def get_background(self):
+        """
+        Return background surface, or None if not set.
+        """
+        return self._background
+
+    def repaint_rect(self, rect):
+        """
+        Add rect area to be redrawn at next draw_retained.
+        """
+        self._repaint.append(rectPool.copy(rect))
+        return None
+
+    def repaint(self):
+        """
+        Redraw all sprites at next draw_retained.
+        """
+        self._drawstate.clear()
+        return None
+
+    def draw_retained(self, surface, background=None):
+        """
+        Draw changed sprites on surface.
+
+        Optional background sets background surface to restore changed areas.
+        Returns list of Rect of changed areas, which can be passed to display.update.
+        The list and its Rect objects are reused at next draw.
+        """
+        profiler = env.profiler
+        if profiler is not None:
+            profiler.start('draw')
+        if background is not None:
+            self._background = background
+        view = rectPool.get(0, 0, surface.width, surface.height)
+        sprites = self._get_visible(surface, view)
+        rectPool.append(view)
+        self._frame += 1
+        frame = self._frame
+        state = self._drawstate
+        layers = self._sprite_layer
+        self._changed = 0
+        for sprite in sprites:
+            spriteID = id(sprite)
+            image = sprite.image
+            x = sprite.rect.x
+            y = sprite.rect.y
+            w = image.width
+            h = image.height
+            layer = layers[spriteID]
+            if spriteID not in state:
+                state[spriteID] = [image, x, y, w, h, image._alpha, layer,
+                                   frame]
+                self._add_changed(x, y, w, h)
+                continue
+            s = state[spriteID]
+            s[7] = frame
+            if (s[0] is image and s[1] == x and s[2] == y and
+                s[3] == w and s[4] == h and
+                s[5] == image._alpha and s[6] == layer):
+                continue
+            if (s[1] < x + w and x < s[1] + s[3] and
+                s[2] < y + h and y < s[2] + s[4]):
+                x1 = s[1] if s[1] < x else x
+                y1 = s[2] if s[2] < y else y
+                x2 = s[1] + s[3]
+                if x + w > x2:
+                    x2 = x + w
+                y2 = s[2] + s[4]
+                if y + h > y2:
+                    y2 = y + h
+                self._add_changed(x1, y1, x2-x1, y2-y1)
+            else:
+                self._add_changed(s[1], s[2], s[3], s[4])
+                self._add_changed(x, y, w, h)
+            s[0] = image
+            s[1] = x
+            s[2] = y
+            s[3] = w
+            s[4] = h
+            s[5] = image._alpha
+            s[6] = layer
+        if len(state) > len(sprites):
+            stale = self._stale
+            for spriteID in state:
+                if state[spriteID][7] != frame:
+                    stale.append(spriteID)
+            for spriteID in stale:
+                s = state[spriteID]
+                self._add_changed(s[1], s[2], s[3], s[4])
+                del state[spriteID]
+            stale[:] = []
+        if self._repaint:
+            for rect in self._repaint:
+                self._add_changed(rect.x, rect.y, rect.width, rect.height)
+            rectPool.extend(self._repaint)
+            self._repaint[:] = []
+        changed = self.changed_areas
+        while len(changed) > self._changed:
+            rectPool.append(changed.pop())
+        if changed:
+            if self._background is not None:
+                surface._blit_clear(self._background, changed)
+            redraw = self._get_redraw(sprites, changed)
+            surface._blits_clip(redraw, changed)
+        if profiler is not None:
+            profiler.stop('draw')
+        return changed
+
+    def _get_redraw(self, sprites, rects):
+        redraw = self._redraw
+        size = len(redraw)
+        count = 0
+        for sprite in sprites:
+            x = sprite.rect.x
+            y = sprite.rect.y
+            w = sprite.image.width
+            h = sprite.image.height
+            for r in rects:
+                if (r.x < x + w and x < r.x + r.width and
+                    r.y < y + h and y < r.y + r.height):
+                    if count < size:
+                        redraw[count] = sprite
+                    else:
+                        redraw.append(sprite)
+                    count += 1
+                    break
+        while len(redraw) > count:
+            redraw.pop()
+        return redraw
 
 
 class LayeredDirty(LayeredUpdates):
@@ -687,6 +1382,351 @@ class LayeredDirty(LayeredUpdates):
         LayeredUpdates(self, *sprites)
 
 
+class Camera(object):
+    """
+    Camera object.
+    """
+
+    def __init__(self, x=0, y=0, zoom=1):
+        """
+        Initialize Camera object.
+
+        Camera transforms group draw from world to surface coordinates, with x,y the world position at surface origin and integer zoom scale.
+        Sprite rects remain in world coordinates.
+        """
+        self.x = int(x)
+        self.y = int(y)
+        self.zoom = 1
+        self.set_zoom(zoom)
+
+    def __str__(self):
+        s = '<%s(%d, %d, zoom %d)>'
+        return s % (self.__class__.__name__, self.x, self.y, self.zoom)
+
+    def __repr__(self):
+        return self.__str__()
+
+    def set_position(self, *position):
+        """
+        Set camera world position at surface origin.
+        """
+        if len(position) == 2:
+            x, y = position
+        else:
+            x, y = position[0]
+        self.x = int(x)
+        self.y = int(y)
+        return None
+
+    def get_position(self):
+        """
+        Return camera world position at surface origin.
+        """
+        return (self.x, self.y)
+
+    def move(self, *offset):
+        """
+        Move camera position offset by x,y.
+        """
+        if len(offset) == 2:
+            x, y = offset
+        else:
+            x, y = offset[0]
+        self.x += int(x)
+        self.y += int(y)
+        return None
+
+    def set_zoom(self, zoom):
+        """
+        Set camera zoom, an integer scale of 1 or more.
+        """
+        zoom = int(zoom)
+        if zoom < 1:
+            zoom = 1
+        self.zoom = zoom
+        return None
+
+    def get_zoom(self):
+        """
+        Return camera zoom.
+        """
+        return self.zoom
+
+    def get_view(self, surface):
+        """
+        Return Rect of world region viewed on surface.
+        """
+        return self._get_view(surface)
+
+    def to_screen(self, rect):
+        """
+        Return Rect of world rect in surface coordinates.
+        """
+        return _screen_rect(rect, self)
+
+    def to_world(self, position):
+        """
+        Return world position of surface position.
+        """
+        return (position[0]//self.zoom + self.x,
+                position[1]//self.zoom + self.y)
+
+    def _get_view(self, surface):
+        zoom = self.zoom
+        return rectPool.get(self.x, self.y,
+                            (surface.width+zoom-1)//zoom,
+                            (surface.height+zoom-1)//zoom)
+
+
+def _screen_rect(rect, camera):
+    if camera is None:
+        return rectPool.copy(rect)
+    zoom = camera.zoom
+    return rectPool.get((rect.x-camera.x)*zoom, (rect.y-camera.y)*zoom,
+                        rect.width*zoom, rect.height*zoom)
+
+
+class SpriteGrid(object):
+    """
+    SpriteGrid object.
+    """
+
+    def __init__(self, cellsize=64):
+        """
+        Initialize SpriteGrid object.
+
+        Spatial hash grid of sprite rects with cells of cellsize, used by group spatial queries.
+        Sprite rect changes are applied with update, which only moves sprites that changed cells.
+        Largest extent of sprite images beyond rects is retained for group draw culling.
+        """
+        self.cellsize = cellsize
+        self._cells = dict()
+        self._entries = dict()
+        self._extent = [0, 0]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, sprite):
+        """
+        Add sprite to grid.
+        """
+        rect = sprite.rect
+        cs = self.cellsize
+        entry = [sprite, rect.x, rect.y, rect.width, rect.height,
+                 rect.x//cs, rect.y//cs, 0, 0]
+        entry[7] = (rect.x + _cellspan(rect.width)) // cs
+        entry[8] = (rect.y + _cellspan(rect.height)) // cs
+        self._entries[id(sprite)] = entry
+        self._insert(entry)
+        self._set_extent(sprite, rect)
+        return None
+
+    def remove(self, sprite):
+        """
+        Remove sprite from grid.
+        """
+        spriteID = id(sprite)
+        if spriteID in self._entries:
+            self._delete(self._entries[spriteID])
+            del self._entries[spriteID]
+        return None
+
+    def clear(self):
+        """
+        Remove all sprites from grid.
+        """
+        self._cells.clear()
+        self._entries.clear()
+        self._extent[0] = 0
+        self._extent[1] = 0
+        return None
+
+    def update(self, sprites):
+        """
+        Update grid with rect change of sprites.
+        """
+        cs = self.cellsize
+        for sprite in sprites:
+            spriteID = id(sprite)
+            if spriteID not in self._entries:
+                continue
+            entry = self._entries[spriteID]
+            rect = sprite.rect
+            self._set_extent(sprite, rect)
+            if (rect.x == entry[1] and rect.y == entry[2] and
+                rect.width == entry[3] and rect.height == entry[4]):
+                continue
+            entry[1] = rect.x
+            entry[2] = rect.y
+            entry[3] = rect.width
+            entry[4] = rect.height
+            cx1 = rect.x // cs
+            cy1 = rect.y // cs
+            cx2 = (rect.x + _cellspan(rect.width)) // cs
+            cy2 = (rect.y + _cellspan(rect.height)) // cs
+            if (cx1 == entry[5] and cy1 == entry[6] and
+                cx2 == entry[7] and cy2 == entry[8]):
+                continue
+            self._delete(entry)
+            entry[5] = cx1
+            entry[6] = cy1
+            entry[7] = cx2
+            entry[8] = cy2
+            self._insert(entry)
+        return None
+
+    def query_point(self, position):
+        """
+        Return list of sprites with rect containing position.
+        """
+        x, y = position[0], position[1]
+        cs = self.cellsize
+        key = (x//cs) * 1048576 + (y//cs)
+        sprites = []
+        if key in self._cells:
+            for sprite in self._cells[key].values():
+                rect = sprite.rect
+                if (rect.x <= x < rect.x + rect.width and
+                    rect.y <= y < rect.y + rect.height):
+                    sprites.append(sprite)
+        return sprites
+
+    def query_rect(self, rect):
+        """
+        Return list of sprites with rect colliding with rect.
+        """
+        cs = self.cellsize
+        cells = self._cells
+        found = dict()
+        sprites = []
+        for cx in range(rect.x//cs, (rect.x + _cellspan(rect.width))//cs + 1):
+            for cy in range(rect.y//cs, (rect.y + _cellspan(rect.height))//cs + 1):
+                key = cx * 1048576 + cy
+                if key not in cells:
+                    continue
+                for spriteID in cells[key]:
+                    if spriteID in found:
+                        continue
+                    found[spriteID] = True
+                    sprite = cells[key][spriteID]
+                    if sprite.rect.colliderect(rect):
+                        sprites.append(sprite)
+        return sprites
+
+    def query_nearest(self, position, distance=None):
+        """
+        Return list of sprites with rect nearest to position.
+
+        Sprites at equal nearest distance are returned.
+        Optional distance limits search.
+        """
+        if not self._entries:
+            return []
+        x, y = position[0], position[1]
+        cs = self.cellsize
+        cells = self._cells
+        cx = x // cs
+        cy = y // cs
+        nearest = []
+        best = distance
+        visited = 0
+        ring = 0
+        while True:
+            if best is not None and (ring-1) * cs > best:
+                break
+            if visited > len(self._entries):
+                return _nearest([entry[0] for entry in self._entries.values()],
+                                position, distance)
+            for i in range(-ring, ring+1):
+                for j in range(-ring, ring+1):
+                    if ring and i != -ring and i != ring and j != -ring and j != ring:
+                        continue
+                    visited += 1
+                    key = (cx+i) * 1048576 + (cy+j)
+                    if key not in cells:
+                        continue
+                    for sprite in cells[key].values():
+                        dist = _distance(sprite.rect, x, y)
+                        if best is None or dist < best:
+                            best = dist
+                            nearest = [sprite]
+                        elif dist == best and sprite not in nearest:
+                            nearest.append(sprite)
+            ring += 1
+        return nearest
+
+    def _insert(self, entry):
+        cells = self._cells
+        sprite = entry[0]
+        spriteID = id(sprite)
+        for cx in range(entry[5], entry[7]+1):
+            for cy in range(entry[6], entry[8]+1):
+                key = cx * 1048576 + cy
+                if key not in cells:
+                    cells[key] = dict()
+                cells[key][spriteID] = sprite
+
+    def _delete(self, entry):
+        cells = self._cells
+        spriteID = id(entry[0])
+        for cx in range(entry[5], entry[7]+1):
+            for cy in range(entry[6], entry[8]+1):
+                key = cx * 1048576 + cy
+                del cells[key][spriteID]
+                if not cells[key]:
+                    del cells[key]
+
+    def _set_extent(self, sprite, rect):
+        if not hasattr(sprite, 'image') or sprite.image is None:
+            return
+        extent = self._extent
+        if sprite.image.width - rect.width > extent[0]:
+            extent[0] = sprite.image.width - rect.width
+        if sprite.image.height - rect.height > extent[1]:
+            extent[1] = sprite.image.height - rect.height
+
+
+def _cellspan(size):
+    if size > 0:
+        return size - 1
+    else:
+        return 0
+
+
+def _distance(rect, x, y):
+    if x < rect.x:
+        dx = rect.x - x
+    elif x >= rect.x + rect.width:
+        dx = x - (rect.x + rect.width) + 1
+    else:
+        dx = 0
+    if y < rect.y:
+        dy = rect.y - y
+    elif y >= rect.y + rect.height:
+        dy = y - (rect.y + rect.height) + 1
+    else:
+        dy = 0
+    if dx and dy:
+        return (dx*dx + dy*dy)**0.5
+    else:
+        return dx + dy
+
+
+def _nearest(sprites, position, distance=None):
+    x, y = position[0], position[1]
+    nearest = []
+    best = distance
+    for sprite in sprites:
+        dist = _distance(sprite.rect, x, y)
+        if best is None or dist < best:
+            best = dist
+            nearest = [sprite]
+        elif dist == best:
+            nearest.append(sprite)
+    return nearest
+
+
 def spritecollide(sprite, group, dokill, collided=None):
     """
     Sprite collision function.
@@ -694,10 +1734,11 @@ def spritecollide(sprite, group, dokill, collided=None):
     Return list of sprites in group that intersect with sprite.
     The dokill argument is a bool, True removes sprites that collide from all groups.
     An optional collided is a callback function taking two sprites and return bool collision.
+    If group has a spatial index, it is used as broadphase to find sprites that intersect before the collided check.
     """
     collide = []
     collision = False
-    for _sprite in group:
+    for _sprite in _broadphase(sprite, group, _get_broadphase(group)):
         if sprite.rect.intersects(_sprite.rect):
             if collided:
                 if not collided(sprite,_sprite):
@@ -710,6 +1751,51 @@ def spritecollide(sprite, group, dokill, collided=None):
     return collide
 
 
+def _get_broadphase(group):
+    #spatial index synced at group update, not refreshed per query
+    if hasattr(group, '_spatial'):
+        return group._spatial
+    return None
+
+
+def _broadphase(sprite, group, spatial):
+    if spatial is not None:
+        return group._sort_sprites(spatial.query_rect(sprite.rect))
+    return group
+
+
+def _get_shape(sprite):
+    #cached collision shape [width, height, radius, ratio, dx, dy, dw, dh]
+    rect = sprite.rect
+    shape = sprite._shape
+    if (shape is None or shape[0] != rect.width or
+            shape[1] != rect.height):
+        shape = [rect.width, rect.height,
+                 (((rect.width**2) + (rect.height**2))**0.5) * 0.5,
+                 None, 0, 0, 0, 0]
+        sprite._shape = shape
+    return shape
+
+
+def _get_radius(sprite):
+    if hasattr(sprite, 'radius'):
+        return sprite.radius
+    return _get_shape(sprite)[2]
+
+
+def _get_ratio_shape(sprite, ratio):
+    shape = _get_shape(sprite)
+    if shape[3] != ratio:
+        x = (shape[0] * ratio) - shape[0]
+        y = (shape[1] * ratio) - shape[1]
+        shape[3] = ratio
+        shape[4] = int(x*0.5)
+        shape[5] = int(y*0.5)
+        shape[6] = int(x)
+        shape[7] = int(y)
+    return shape
+
+
 def collide_rect(sprite1, sprite2):
     """
     Sprite collision function.
@@ -726,6 +1812,7 @@ def collide_rect_ratio(ratio):
 
     Return a callable that checks if the rects of the two sprites intersect.
     The ratio attribute will determine scaling of the rect, where 1.0 is same size.
+    Scaled rect offsets are cached on the sprite and recomputed when rect size changes.
     Can be used as spritecollide callback function.
     """
     obj = _collide_rect_ratio(ratio)
@@ -740,20 +1827,20 @@ class _collide_rect_ratio(object):
         self.ratio = ratio
 
     def __call__(self, sprite1, sprite2):   #__call__ not implemented in pyjs
+        s = _get_ratio_shape(sprite1, self.ratio)
         r = sprite1.rect
-        x = (r.width * self.ratio) - r.width
-        y = (r.height * self.ratio) - r.height
-        r1 = rectPool.get(r.x - int(x*0.5), r.y - int(y*0.5),
-                          r.width + int(x), r.height + int(y))
+        x1 = r.x - s[4]
+        y1 = r.y - s[5]
+        w1 = r.width + s[6]
+        h1 = r.height + s[7]
+        s = _get_ratio_shape(sprite2, self.ratio)
         r = sprite2.rect
-        x = (r.width * self.ratio) - r.width
-        y = (r.height * self.ratio) - r.height
-        r2 = rectPool.get(r.x - int(x*0.5), r.y - int(y*0.5),
-                          r.width + int(x), r.height + int(y))
-        collide = r1.intersects(r2)
-        rectPool.append(r1)
-        rectPool.append(r2)
-        return collide
+        x2 = r.x - s[4]
+        y2 = r.y - s[5]
+        w2 = r.width + s[6]
+        h2 = r.height + s[7]
+        return (x1 < (x2 + w2) and x2 < (x1 + w1) and
+                y1 < (y2 + h2) and y2 < (y1 + h1))
 
 
 def collide_circle(sprite1, sprite2):
@@ -762,23 +1849,15 @@ def collide_circle(sprite1, sprite2):
 
     Check two sprites intersect by checking by intersection of circle around their centers.
     Will use sprite radius attribute or circle will encompass rect attribute.
+    The encompassing radius is cached on the sprite and recomputed when rect size changes.
     Can be used as spritecollide callback function.
     """
-    if hasattr(sprite1, 'radius'):
-        radius1 = sprite1.radius
-    else:
-        radius1 = (((((sprite1.rect.width)**2)
-                   + ((sprite1.rect.height)**2))**0.5) * 0.5)
-    if hasattr(sprite2, 'radius'):
-        radius2 = sprite2.radius
-    else:
-        radius2 = (((((sprite2.rect.width)**2)
-                   + ((sprite2.rect.height)**2))**0.5) * 0.5)
+    radius = _get_radius(sprite1) + _get_radius(sprite2)
     sx1 = (sprite1.rect.x + int(sprite1.rect.width * 0.5))
     sy1 = (sprite1.rect.y + int(sprite1.rect.height * 0.5))
     sx2 = (sprite2.rect.x + int(sprite2.rect.width * 0.5))
     sy2 = (sprite2.rect.y + int(sprite2.rect.height * 0.5))
-    return (((sx1 - sx2)**2 + (sy1 - sy2)**2)) < (radius1**2 + radius2**2)
+    return ((sx1 - sx2)**2 + (sy1 - sy2)**2) <= radius**2
 
 
 def collide_circle_ratio(ratio):
@@ -788,6 +1867,7 @@ def collide_circle_ratio(ratio):
     Return a callable that checks two sprites intersect by checking by intersection of circle around their centers.
     The ratio attribute will determine scaling of the circle, where 1.0 is same size.
     Will use sprite radius attribute or circle will encompass rect attribute.
+    The encompassing radius is cached on the sprite and recomputed when rect size changes.
     Can be used as spritecollide callback function.
     """
     obj = _collide_circle_ratio(ratio)
@@ -802,21 +1882,77 @@ class _collide_circle_ratio(object):
         self.ratio = ratio
 
     def __call__(self, sprite1, sprite2):   #__call__ not implemented in pyjs
-        if hasattr(sprite1, 'radius'):
-            radius1 = sprite1.radius * self.ratio
-        else:
-            radius1 = (((((sprite1.rect.width)**2)
-                       + ((sprite1.rect.height)**2))**0.5) * 0.5 * self.ratio)
-        if hasattr(sprite2, 'radius'):
-            radius2 = sprite2.radius * self.ratio
-        else:
-            radius2 = (((((sprite2.rect.width)**2)
-                       + ((sprite2.rect.height)**2))**0.5) * 0.5 * self.ratio)
+        radius = (_get_radius(sprite1) + _get_radius(sprite2)) * self.ratio
         sx1 = (sprite1.rect.x + int(sprite1.rect.width * 0.5))
         sy1 = (sprite1.rect.y + int(sprite1.rect.height * 0.5))
         sx2 = (sprite2.rect.x + int(sprite2.rect.width * 0.5))
         sy2 = (sprite2.rect.y + int(sprite2.rect.height * 0.5))
-        return ((sx1 - sx2)**2 + (sy1 - sy2)**2) < (radius1**2 + radius2**2)
+        return ((sx1 - sx2)**2 + (sy1 - sy2)**2) <= radius**2
+
+
+def sweepcollide(sprite, group, dokill, circle=False):
+    """
+    Sprite swept collision function.
+
+    Return list of (sprite, time, normal) of sprites in group that collide with sprite during their movement, ordered by time.
+    Movement is from previous rect stored by group track_rects to current rect, sprite previous rect is from its groups with tracking, untracked sprites are stationary.
+    Time of impact is fraction 0.0 to 1.0 of the movement, and normal is (x,y) contact normal of the group sprite.
+    The dokill argument is a bool, True removes sprites that collide from all groups.
+    The circle argument is a bool, True sweeps circles of sprite radius attribute or encompassing rect, otherwise rects.
+    """
+    prev = _get_previous(sprite, group)
+    rect = sprite.rect
+    dx = rect.x - prev.x
+    dy = rect.y - prev.y
+    x1 = min(prev.x, rect.x)
+    y1 = min(prev.y, rect.y)
+    x2 = max(prev.x + prev.width, rect.x + rect.width)
+    y2 = max(prev.y + prev.height, rect.y + rect.height)
+    pad = 0
+    if circle:
+        radius = _get_radius(sprite)
+        position = Vector2(prev.x + int(prev.width * 0.5),
+                           prev.y + int(prev.height * 0.5))
+        x1 -= radius
+        y1 -= radius
+        x2 += radius
+        y2 += radius
+    collide = []
+    for _sprite in group:
+        _prev = group.get_previous_rect(_sprite)
+        _rect = _sprite.rect
+        if circle:
+            pad = _get_radius(_sprite)
+        if (x2 < min(_prev.x, _rect.x) - pad or
+            y2 < min(_prev.y, _rect.y) - pad or
+            max(_prev.x + _prev.width, _rect.x + _rect.width) + pad < x1 or
+            max(_prev.y + _prev.height, _rect.y + _rect.height) + pad < y1):
+            continue
+        displacement = (dx - (_rect.x - _prev.x), dy - (_rect.y - _prev.y))
+        if circle:
+            center = (_prev.x + int(_prev.width * 0.5),
+                      _prev.y + int(_prev.height * 0.5))
+            hit = position.sweep_circle(radius, displacement,
+                                        center, _get_radius(_sprite))
+        else:
+            hit = prev.sweep(_prev, displacement)
+        if hit is not None:
+            collide.append((_sprite, hit[0], hit[1]))
+    if collide:
+        collide.sort(key=lambda c: c[1])
+        if dokill:
+            for c in collide:
+                c[0].kill()
+    return collide
+
+
+def _get_previous(sprite, group):
+    if group._tracked is not None and id(sprite) in group._tracked:
+        return group._tracked[id(sprite)]
+    for _group in sprite._groups.values():
+        if _group._tracked is not None and id(sprite) in _group._tracked:
+            return _group._tracked[id(sprite)]
+    return sprite.rect
 
 
 def collide_mask(sprite1, sprite2):
@@ -848,11 +1984,13 @@ def groupcollide(group1, group2, dokill1, dokill2):
 
     Return dictionary of sprites in group1 with list of sprites in group2 that intersect.
     The dokill argument is a bool, True removes sprites that collide from all groups.
+    If group2 has a spatial index, it is updated once and used to find sprites that intersect.
     """
     collide = {}
     collision = False
+    spatial = _get_broadphase(group2)
     for sprite1 in group1:
-        for sprite2 in group2:
+        for sprite2 in _broadphase(sprite1, group2, spatial):
             if sprite1.rect.intersects(sprite2.rect):
                 if sprite1 not in collide:
                     collide[sprite1] = []
@@ -875,7 +2013,7 @@ def spritecollideany(sprite, group):
 
     Check if sprite intersect with any sprites in group.
     """
-    for _sprite in group:
+    for _sprite in _broadphase(sprite, group, _get_broadphase(group)):
         if sprite.rect.intersects(_sprite.rect):
             return True
     return False
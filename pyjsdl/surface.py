@@ -229,13 +229,45 @@ class Surface(HTML5Canvas):
         ctx.globalAlpha = 1.0
         return rects
 
-    def _blits(self, surfaces):
+    def _blits(self, sprites, offset=None, zoom=1):
         ctx = self.impl.canvasContext
-        for surface, rect in surfaces:
-            ctx.globalAlpha = surface._alpha
-            ctx.drawImage(surface.canvas, rect.x, rect.y)
+        if offset is None:
+            for sprite in sprites:
+                surface = sprite.image
+                rect = sprite.rect
+                ctx.globalAlpha = surface._alpha
+                ctx.drawImage(surface.canvas, rect.x, rect.y)
+        elif zoom == 1:
+            x, y = offset
+            for sprite in sprites:
+                surface = sprite.image
+                rect = sprite.rect
+                ctx.globalAlpha = surface._alpha
+                ctx.drawImage(surface.canvas, rect.x-x, rect.y-y)
+        else:
+            x, y = offset
+            smoothing = ctx.imageSmoothingEnabled
+            ctx.imageSmoothingEnabled = False
+            for sprite in sprites:
+                surface = sprite.image
+                rect = sprite.rect
+                ctx.globalAlpha = surface._alpha
+                ctx.drawImage(surface.canvas,
+                              (rect.x-x)*zoom, (rect.y-y)*zoom,
+                              surface.width*zoom, surface.height*zoom)
+            ctx.imageSmoothingEnabled = smoothing
         ctx.globalAlpha = 1.0
 
+    def _blits_clip(self, sprites, rect_list):
+        ctx = self.impl.canvasContext
+        ctx.save()
+        ctx.beginPath()
+        for r in rect_list:
+            ctx.rect(r.x, r.y, r.width, r.height)
+        ctx.clip()
+        self._blits(sprites)
+        ctx.restore()
+
     def _blit_clear(self, surface, rect_list):
         ctx = self.impl.canvasContext
         ctx.globalAlpha = surface._alpha
@@ -8,7 +8,8 @@ The module provides time monitoring functionality.
 """
 
 from pyjsdl import env
-from pyjsdl.pyjsobj import performanceNowInit
+from pyjsdl.pyjsobj import performanceNowInit, document
+from pyjsdl.pyjsarray import Float64Array
 from __pyjamas__ import JS
 
 
@@ -61,14 +62,87 @@ class Clock(object):
         """
         return self.tick(framerate)
 
+    def set_timestep(self, timestep=0, maxsteps=5, render=None):
+        """
+        Set fixed timestep.
+
+        Argument timestep (ms) runs callback at fixed simulation steps decoupled from display refresh, 0 to run callback each frame.
+        Frame time is accumulated with remainder carried over, and callback run for each elapsed timestep.
+        Optional maxsteps limits catch-up steps per frame, with excess time dropped.
+        Optional render function is called each frame with interpolation alpha (0.0 to 1.0) between steps.
+        """
+        env.canvas.set_timestep(timestep, maxsteps, render)
+        return None
+
+    def get_timestep(self):
+        """
+        Return fixed timestep (ms), 0 if not set.
+        """
+        return env.canvas._timestep
+
+    def get_alpha(self):
+        """
+        Return interpolation alpha of last frame in fixed timestep mode.
+        """
+        return env.canvas._alpha
+
     def get_fps(self):
         """
         Return fps.
+
+        Calculated from mean frame time of frame statistics window.
         """
         if not env.canvas._pause:
-            return 1000.0 / env.canvas._frametime
-        else:
-            return 0.0
+            frametime = env.canvas._stats.get_mean()
+            if not frametime:
+                frametime = env.canvas._frametime
+            if frametime:
+                return 1000.0 / frametime
+        return 0.0
+
+    def set_stats(self, size=120, budget=0):
+        """
+        Set frame statistics window.
+
+        Argument size is number of frames retained in the rolling window.
+        Optional budget (ms) is the frame time target to count dropped frames, defaults to tick framerate or 60fps.
+        """
+        env.canvas._stats = FrameStats(size, budget)
+        return None
+
+    def get_stats(self):
+        """
+        Return frame statistics.
+
+        Statistics of rolling window returned in dict with keys:
+        'frames' number of frames in window,
+        'mean', 'p50', 'p95', 'p99' frame time (ms),
+        'dropped' frames exceeding 1.5x frame budget,
+        'callback' mean time (ms) in program callback,
+        'render' mean time (ms) in display render.
+        """
+        stats = env.canvas._stats
+        percentiles = stats.get_percentiles((50, 95, 99))
+        return {'frames': stats.get_count(),
+                'mean': stats.get_mean(),
+                'p50': percentiles[0],
+                'p95': percentiles[1],
+                'p99': percentiles[2],
+                'dropped': stats.get_dropped(),
+                'callback': stats.get_mean(stats.callback),
+                'render': stats.get_mean(stats.render)}
+
+    def get_percentile(self, percentile):
+        """
+        Return frame time (ms) at percentile (0-100) of frame statistics window.
+        """
+        return env.canvas._stats.get_percentiles((percentile,))[0]
+
+    def get_dropped(self):
+        """
+        Return count of dropped frames in frame statistics window.
+        """
+        return env.canvas._stats.get_dropped()
 
     def time(self):
         """
@@ -77,20 +151,123 @@ class Clock(object):
         return self._wnd.performance.now()
 
 
+class FrameStats(object):
+    """
+    FrameStats object.
+    """
+
+    def __init__(self, size=120, budget=0):
+        """
+        Initialize frame statistics object.
+
+        Retains frame, callback and render time (ms) of the last size frames in circular typed arrays.
+        Optional budget (ms) is the frame time target to count dropped frames.
+        """
+        self.size = size
+        self.budget = budget
+        self.frame = Float64Array(size)
+        self.callback = Float64Array(size)
+        self.render = Float64Array(size)
+        self._index = 0
+        self._count = 0
+
+    def add(self, frametime, callbacktime, rendertime):
+        """
+        Add frame timing to statistics window.
+        """
+        index = self._index
+        self.frame[index] = frametime
+        self.callback[index] = callbacktime
+        self.render[index] = rendertime
+        index += 1
+        if index == self.size:
+            index = 0
+        self._index = index
+        if self._count < self.size:
+            self._count += 1
+        return None
+
+    def get_count(self):
+        """
+        Return number of frames in statistics window.
+        """
+        return self._count
+
+    def get_mean(self, data=None):
+        """
+        Return mean frame time (ms).
+
+        Optional data argument of callback or render array.
+        """
+        if not self._count:
+            return 0.0
+        if data is None:
+            data = self.frame
+        total = 0.0
+        for i in range(self._count):
+            total += data[i]
+        return total / self._count
+
+    def get_percentiles(self, percentiles):
+        """
+        Return list of frame time (ms) at percentiles (0-100).
+        """
+        if not self._count:
+            return [0.0 for p in percentiles]
+        data = self.frame.slice(0, self._count)
+        data.getArray().sort()
+        values = []
+        for p in percentiles:
+            index = int(p * self._count / 100.0)
+            if index >= self._count:
+                index = self._count - 1
+            values.append(data[index])
+        return values
+
+    def get_dropped(self):
+        """
+        Return count of frames exceeding 1.5x frame budget.
+        """
+        budget = self.budget
+        if not budget:
+            budget = env.canvas._framerate
+            if not budget or env.canvas._pause:
+                budget = 1000.0 / 60
+        limit = budget * 1.5
+        dropped = 0
+        for i in range(self._count):
+            if self.frame[i] > limit:
+                dropped += 1
+        return dropped
+
+    def reset(self):
+        """
+        Reset statistics window.
+        """
+        self._index = 0
+        self._count = 0
+        return None
+
+
 class Time(object):
     """
     Time object.
     """
 
     _wnd = None
+    _scheduler = None
 
     def __init__(self):
         """
         Initialize time object.
+
+        Timers of time objects are serviced by a shared TimerScheduler.
         """
         self.Clock = Clock
         Time._wnd = performanceNowInit()
         Clock._wnd = Time._wnd
+        if Time._scheduler is None:
+            Time._scheduler = TimerScheduler(Time._wnd)
         self._time_init = self.time()
         self._framerate = 0
         self._timers = {}
@@ -132,6 +309,7 @@ class Time(object):
             if env.canvas._pause:
                 env.canvas._framerate = self._framerate
                 env.canvas._rendertime = self.time()
+                env.canvas._accumulator = 0.0
                 env.canvas._pause = False
         return time
 
@@ -170,11 +348,10 @@ class Time(object):
         Set timeout.
 
         Timeout time (in ms) before triggering obj.run method.
+        Timeouts are serviced at display frames once the canvas is running.
         Return timer id.
         """
-        run = lambda: obj.run()
-        id = JS("$wnd['setTimeout'](@{{run}}, @{{time}});")
-        return id
+        return self._scheduler.add(obj, time, 0)
 
     def clear_timeout(self, id):
         """
@@ -182,7 +359,7 @@ class Time(object):
 
         Argument timer id of set_timeout.
         """
-        JS("$wnd['clearTimeout'](@{{id}});")
+        self._scheduler.remove(id)
         return None
 
     def set_interval(self, obj, time):
@@ -190,11 +367,13 @@ class Time(object):
         Set interval timeout.
 
         Recurring timeout time (in ms) before triggering obj.run method.
+        Intervals are scheduled against absolute deadlines to avoid drift.
+        Interval time under 1 ms is set to 1 ms, still recurring.
         Return timer id.
         """
-        run = lambda: obj.run()
-        id = JS("$wnd['setInterval'](@{{run}}, @{{time}});")
-        return id
+        if time < 1:
+            time = 1
+        return self._scheduler.add(obj, time, time)
 
     def clear_interval(self, id):
         """
@@ -202,10 +381,103 @@ class Time(object):
 
         Argument timer id of set_interval.
         """
-        JS("$wnd['clearInterval'](@{{id}});")
+        self._scheduler.remove(id)
         return None
 
 
+class TimerScheduler(object):
+    """
+    TimerScheduler object.
+    """
+
+    def __init__(self, wnd):
+        """
+        Initialize timer scheduler.
+
+        Maintains timers of set_timer, set_timeout and set_interval against absolute deadlines.
+        Timers are serviced in one pass at each display frame when the canvas is running and visible,
+        otherwise with a single browser timeout set to the next deadline, including after the canvas is stopped.
+        Module initialization creates scheduler instance shared by Time objects.
+        """
+        self._wnd = wnd
+        self._timers = {}
+        self._id = 0
+        self._next = None
+        self._timeout = None
+        self._run = lambda: self._run_timeout()
+
+    def add(self, obj, time, interval):
+        """
+        Add timer to trigger obj.run method after time (ms).
+
+        Argument interval (ms) to repeat, 0 for no repeat.
+        Return timer id.
+        """
+        self._id += 1
+        deadline = self._wnd.performance.now() + time
+        self._timers[self._id] = [deadline, interval, obj]
+        if self._next is None or deadline < self._next:
+            self._next = deadline
+            self._arm()
+        return self._id
+
+    def remove(self, id):
+        """
+        Remove timer.
+        """
+        if id in self._timers:
+            del self._timers[id]
+            if not self._timers:
+                self._next = None
+        return None
+
+    def run(self, now):
+        """
+        Service timers with deadline reached at time now (ms).
+        """
+        if self._next is None or now < self._next:
+            return
+        ids = [id for id in self._timers]
+        for id in ids:
+            if id not in self._timers:
+                continue
+            timer = self._timers[id]
+            if timer[0] <= now:
+                if timer[1]:
+                    timer[0] += timer[1]
+                    if timer[0] <= now:
+                        timer[0] += (int((now - timer[0]) / timer[1]) + 1) * timer[1]
+                else:
+                    del self._timers[id]
+                timer[2].run()
+        self._next = None
+        for id in self._timers:
+            if self._next is None or self._timers[id][0] < self._next:
+                self._next = self._timers[id][0]
+        self._arm()
+
+    def _framed(self):
+        if env.canvas is None or not env.canvas._running:
+            return False
+        return not document.getVisibility()
+
+    def _arm(self):
+        if self._timeout is not None:
+            JS("$wnd['clearTimeout'](@{{self}}['_timeout']);")
+            self._timeout = None
+        if self._next is None or self._framed():
+            return
+        delay = self._next - self._wnd.performance.now()
+        if delay < 0:
+            delay = 0
+        run = self._run
+        self._timeout = JS("$wnd['setTimeout'](@{{run}}, @{{delay}});")
+
+    def _run_timeout(self):
+        self._timeout = None
+        self.run(self._wnd.performance.now())
+
+
 class _EventTimer:
 
     def __init__(self, event):
@@ -224,16 +496,18 @@ class _EventTimer:
             self.set_timeout()
 
     def set_timeout(self):
-        run = lambda: self.run()
-        timer = JS("$wnd['setTimeout'](@{{run}}, @{{self}}['time']);")
-        self.timer = timer
+        if self.repeat:
+            interval = self.time
+        else:
+            interval = 0
+        self.timer = Time._scheduler.add(self, self.time, interval)
 
     def clear_timeout(self):
-        JS("$wnd['clearTimeout'](@{{self}}['timer']);")
+        Time._scheduler.remove(self.timer)
         self.timer = None
 
     def run(self):
         env.event.post(self.event)
-        if self.repeat:
-            self.set_timeout()
+        if not self.repeat:
+            self.timer = None
 
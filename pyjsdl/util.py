@@ -11,6 +11,7 @@ from pyjsdl.time import Time
 from pyjsdl.rect import Rect
 from pyjsdl import env
 from __pyjamas__ import JS, doc
+import json
 
 
 class Timer(object):
@@ -126,6 +127,147 @@ class Timer(object):
                 self.log.setCursorPos(len(text))
 
 
+class Profiler(object):
+    """
+    Frame phase profiler.
+
+    When enabled, main loop phases are timed: 'event' dispatch, program 'callback', sprite group 'draw', display 'update' rect collection and canvas 'render'.
+    Program code can time named spans with start/stop.
+    Span times are aggregated in histograms reported as text or JSON.
+    """
+
+    bins = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 33.0, 66.0)
+
+    def __init__(self, bins=None):
+        """
+        Initialize profiler object.
+
+        Optional bins argument is a sequence of histogram bin upper bounds (ms).
+        """
+        self.time = Time()
+        if bins is not None:
+            self.bins = tuple(bins)
+        self._spans = {}
+        self._start = {}
+        self._order = []
+
+    def enable(self):
+        """
+        Enable profiler to time main loop phases.
+        """
+        env.set_env('profiler', self)
+        return None
+
+    def disable(self):
+        """
+        Disable profiler.
+        """
+        if env.profiler is self:
+            env.set_env('profiler', None)
+        return None
+
+    def get_time(self):
+        """
+        Get current time (ms).
+        """
+        return self.time.time()
+
+    def start(self, name):
+        """
+        Start timing span name.
+        """
+        self._start[name] = self.time.time()
+        return None
+
+    def stop(self, name):
+        """
+        Stop timing span name.
+
+        Return span time (ms).
+        """
+        if name not in self._start:
+            return 0.0
+        dtime = self.time.time() - self._start[name]
+        del self._start[name]
+        self.add(name, dtime)
+        return dtime
+
+    def add(self, name, dtime):
+        """
+        Add time (ms) to span name.
+        """
+        if name not in self._spans:
+            self._spans[name] = [0, 0.0, dtime, dtime,
+                                 [0 for i in range(len(self.bins)+1)]]
+            self._order.append(name)
+        span = self._spans[name]
+        span[0] += 1
+        span[1] += dtime
+        if dtime < span[2]:
+            span[2] = dtime
+        if dtime > span[3]:
+            span[3] = dtime
+        index = 0
+        for bound in self.bins:
+            if dtime <= bound:
+                break
+            index += 1
+        span[4][index] += 1
+        return None
+
+    def reset(self):
+        """
+        Reset profiler data.
+        """
+        self._spans.clear()
+        self._start.clear()
+        self._order[:] = []
+        return None
+
+    def get_stats(self):
+        """
+        Return profile statistics.
+
+        Statistics returned in dict of span name with dict of 'count', 'total', 'mean', 'min', 'max' (ms) and 'histogram' bin counts.
+        """
+        stats = {}
+        for name in self._order:
+            span = self._spans[name]
+            stats[name] = {'count': span[0],
+                           'total': span[1],
+                           'mean': span[1] / span[0],
+                           'min': span[2],
+                           'max': span[3],
+                           'histogram': span[4][:]}
+        return stats
+
+    def report(self, format='text'):
+        """
+        Return profile report.
+
+        Argument format is 'text' or 'json'.
+        """
+        stats = self.get_stats()
+        if format == 'json':
+            return json.dumps({'bins': list(self.bins), 'spans': stats})
+        lines = ['%-12s %8s %10s %8s %8s %8s' % ('span', 'count', 'total',
+                                                 'mean', 'min', 'max')]
+        for name in self._order:
+            st = stats[name]
+            lines.append('%-12s %8d %10.2f %8.3f %8.3f %8.3f' % (name,
+                         st['count'], st['total'], st['mean'],
+                         st['min'], st['max']))
+        labels = ['<=%s' % bound for bound in self.bins]
+        labels.append('>%s' % self.bins[-1])
+        lines.append('')
+        lines.append('%-12s %s' % ('ms', ' '.join(['%7s' % label
+                                                   for label in labels])))
+        for name in self._order:
+            lines.append('%-12s %s' % (name, ' '.join(['%7d' % count
+                                       for count in stats[name]['histogram']])))
+        return '\n'.join(lines)
+
+
 class PyjsMode:
     """
     Check Pyjs mode used to compile application.
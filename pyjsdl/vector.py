@@ -211,6 +211,36 @@ class Vector2(object):
         return ((self.x - vector[0])**2
               + (self.y - vector[1])**2)
 
+    def sweep_circle(self, radius, displacement, center, center_radius):
+        """
+        Return swept collision of circle at this position moved by displacement with circle at center.
+
+        Argument displacement is (x,y) movement of this circle, for moving circle use displacement relative to its movement.
+        Return tuple of time of impact as fraction 0.0 to 1.0 of displacement and contact normal (x,y) of circle at center, or None if no collision.
+        Circles that overlap at start return time 0.0 and normal (0.0,0.0).
+        """
+        mx = self.x - center[0]
+        my = self.y - center[1]
+        dx = displacement[0]
+        dy = displacement[1]
+        r = radius + center_radius
+        c = (mx * mx) + (my * my) - (r * r)
+        if c < 0:
+            return (0.0, (0.0, 0.0))
+        a = (dx * dx) + (dy * dy)
+        b = (mx * dx) + (my * dy)
+        if a == 0 or b >= 0:
+            return None
+        disc = (b * b) - (a * c)
+        if disc < 0:
+            return None
+        t = (-b - sqrt(disc)) / a
+        if t > 1.0:
+            return None
+        if r == 0:
+            return (t, (0.0, 0.0))
+        return (t, ((mx + dx * t) / r, (my + dy * t) / r))
+
     def lerp(self, vector, t):
         """
         Return vector linear interpolated by t to the given vector.
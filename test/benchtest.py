@@ -0,0 +1,401 @@
+"""
+Benchtest
+
+Check doc/benchtest.txt for information.
+"""
+
+import os, sys
+
+if os.name in ('posix', 'nt', 'os2', 'ce', 'riscos'):
+    os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = "hide"
+    import pygame as pg
+    platform = 'pc'
+    executor = 'python'
+    library = 'pygame'
+elif os.name == 'java':
+    import pyj2d as pg
+    platform = 'jvm'
+    executor = 'jython'
+    library = 'pyj2d'
+else:
+    import pyjsdl as pg
+    platform = 'js'
+    executor = 'pyjs'
+    library = 'pyjsdl'
+
+import json
+from test import sprite_test
+
+if library == 'pyjsdl':
+    from pyjsdl.util import Timer
+    from __pyjamas__ import JS
+else:
+    import time as _time
+
+    class Timer(object):
+        """
+        Timer with pyjsdl.util.Timer interface.
+        """
+
+        def __init__(self):
+            self.time_i = self.get_time()
+            self.dtime = []
+            self.number = 0
+
+        def get_time(self):
+            return _time.time() * 1000.0
+
+        def set_time(self):
+            self.time_i = self.get_time()
+
+        def lap_time(self, time_i=None, time_f=None, number=100,
+                     print_result=True):
+            if time_i is None:
+                time_i = self.time_i
+            if time_f is None:
+                time_f = self.get_time()
+            self.dtime.append(time_f-time_i)
+            self.number += 1
+            if self.number >= number:
+                t_ave = ( sum(self.dtime)/number )
+                self.dtime = []
+                self.number = 0
+                if print_result:
+                    print("Time: %s" % t_ave)
+                return t_ave
+
+
+def memory_used(func):
+    """
+    Call func and return tuple of result and heap memory (bytes) allocated, or None if not available.
+    """
+    if library == 'pyjsdl':
+        mem = JS("($wnd['performance']['memory'] ? $wnd['performance']['memory']['usedJSHeapSize'] : 0)")
+        result = func()
+        mem = JS("($wnd['performance']['memory'] ? $wnd['performance']['memory']['usedJSHeapSize'] : 0)") - mem
+    else:
+        try:
+            import tracemalloc
+        except ImportError:
+            return func(), None
+        tracemalloc.start()
+        mem = tracemalloc.get_traced_memory()[0]
+        result = func()
+        mem = tracemalloc.get_traced_memory()[0] - mem
+        tracemalloc.stop()
+    if mem <= 0:
+        mem = None
+    return result, mem
+
+
+class Benchmark(object):
+    """
+    Benchmark runner.
+
+    Each case is a function that sets up data and returns a tuple of the run function to time and a dict of case information or None.
+    A case raises NotImplementedError to skip on a library.
+    The run function is called warmup times, then timed for repeat repetitions of number calls.
+    """
+
+    def __init__(self, warmup=5, repeat=10, number=10):
+        self.timer = Timer()
+        self.warmup = warmup
+        self.repeat = repeat
+        self.number = number
+
+    def run_case(self, case):
+        """
+        Run benchmark case.
+
+        Return result dict, or None if case skipped.
+        """
+        try:
+            run, info = case()
+        except NotImplementedError:
+            return None
+        for i in range(self.warmup):
+            run()
+        times = []
+        for i in range(self.repeat):
+            self.timer.set_time()
+            for j in range(self.number):
+                run()
+            dtime = self.timer.lap_time(number=1, print_result=False)
+            times.append(dtime / self.number)
+        result = self.stats(times)
+        result['case'] = case.__name__[5:]
+        result['library'] = library
+        result['executor'] = executor
+        result['warmup'] = self.warmup
+        result['repeat'] = self.repeat
+        result['number'] = self.number
+        if info:
+            for key in info:
+                result[key] = info[key]
+        return result
+
+    def stats(self, times):
+        """
+        Return dict of mean, median, min, max and stdev (ms) of times.
+        """
+        times = sorted(times)
+        size = len(times)
+        mean = sum(times) / size
+        if size % 2:
+            median = times[size//2]
+        else:
+            median = (times[size//2-1] + times[size//2]) / 2.0
+        var = sum([(t-mean)*(t-mean) for t in times]) / size
+        return {'mean': mean,
+                'median': median,
+                'min': times[0],
+                'max': times[-1],
+                'stdev': var ** 0.5}
+
+
+def case_rect():
+    rects = [pg.Rect((i%10)*10, (i//10)*10, 12, 12) for i in range(100)]
+    rect = pg.Rect(40, 40, 30, 30)
+    def run():
+        for r in rects:
+            rect.colliderect(r)
+            rect.union(r)
+            rect.clip(r)
+            r.move(1, 1)
+        rect.collidelistall(rects)
+    return run, {'ops': 401}
+
+
+def case_blits():
+    surface = pg.Surface((200, 200))
+    image = pg.Surface((10, 10))
+    image.fill((255, 0, 0))
+    blits = [(image, ((i%20)*10, (i//20)*10)) for i in range(200)]
+    def run():
+        surface.blits(blits, False)
+    return run, {'ops': len(blits)}
+
+
+def case_mask_overlap():
+    surface = pg.Surface((64, 64), pg.SRCALPHA)
+    pg.draw.circle(surface, (255, 0, 0), (32, 32), 30)
+    mask1 = pg.mask.from_surface(surface)
+    mask2 = pg.mask.from_surface(surface)
+    offsets = [(x, x//2) for x in range(-60, 61, 6)]
+    def run():
+        for offset in offsets:
+            mask1.overlap(mask2, offset)
+    return run, {'ops': len(offsets)}
+
+
+def case_bitset():
+    if library != 'pyjsdl':
+        raise NotImplementedError
+    from pyjsdl.pyjsarray import BitSet
+    bitset1 = BitSet(4096)
+    bitset2 = BitSet(4096)
+    for i in range(0, 4096, 3):
+        bitset1.set(i)
+    for i in range(0, 4096, 5):
+        bitset2.set(i)
+    def run():
+        for i in range(0, 4096, 7):
+            bitset1.get(i)
+        bitset1.intersects(bitset2)
+        bitset1.cardinality()
+        bitset3 = bitset1.get(0, 4096)
+        bitset3.andSet(bitset2)
+        bitset3.orSet(bitset2)
+    return run, None
+
+
+def case_ndarray():
+    if library == 'pyjsdl':
+        from pyjsdl.pyjsarray import Ndarray
+        array1 = Ndarray((100, 100), 'float64')
+        array2 = Ndarray((100, 100), 'float64')
+    else:
+        try:
+            import numpy
+        except ImportError:
+            raise NotImplementedError
+        array1 = numpy.zeros((100, 100), 'float64')
+        array2 = numpy.zeros((100, 100), 'float64')
+    array1.fill(1.5)
+    array2.fill(2.0)
+    def run():
+        array3 = array1.__add__(array2)
+        array3 = array3.__mul__(array2)
+        array3.__iadd__(array1)
+    return run, {'size': 10000}
+
+
+def case_event_queue():
+    events = [pg.event.Event(pg.USEREVENT, {'code': i}) for i in range(100)]
+    pg.event.clear()
+    def run():
+        for event in events:
+            pg.event.post(event)
+        pg.event.get(pg.USEREVENT)
+        for event in events:
+            pg.event.post(event)
+        pg.event.get()
+    return run, {'ops': 2*len(events)}
+
+
+def case_event_attr():
+    size = 1000
+    create = lambda: [pg.event.Event(pg.USEREVENT, pos=(i,i), button=1,
+                                     key=pg.K_a, mod=0, z=i)
+                      for i in range(size)]
+    events, memory = memory_used(create)
+    if memory is not None:
+        memory = memory / float(size)
+    def run():
+        total = 0
+        for event in events:
+            total += (event.pos[0] + event.button +
+                      event.key + event.mod + event.z)
+        return total
+    return run, {'ops': 5*size, 'bytes_per_event': memory}
+
+
+def case_sprite_draw():
+    surface = pg.Surface((200, 200))
+    image = pg.Surface((10, 10))
+    image.fill((0, 255, 0))
+    group = pg.sprite.RenderUpdates()
+    for i in range(200):
+        sprite = pg.sprite.Sprite()
+        sprite.image = image
+        sprite.rect = pg.Rect((i%20)*10, (i//20)*10, 10, 10)
+        group.add(sprite)
+    def run():
+        group.draw(surface)
+    return run, {'ops': len(group)}
+
+
+def case_sprite_updates_1k():
+    sprite_test.init({'pg': pg, 'library': library})
+    return sprite_test.bench_sprite_updates(1000)
+
+
+def case_sprite_updates_10k():
+    sprite_test.init({'pg': pg, 'library': library})
+    return sprite_test.bench_sprite_updates(10000)
+
+
+bench_cases = [case_rect,
+               case_blits,
+               case_mask_overlap,
+               case_bitset,
+               case_ndarray,
+               case_event_queue,
+               case_event_attr,
+               case_sprite_draw,
+               case_sprite_updates_1k,
+               case_sprite_updates_10k]
+
+
+bench_case_name = {}
+for _case in bench_cases:
+    bench_case_name[_case.__name__[5:]] = _case
+
+
+class Log:
+
+    def __init__(self):
+        self._log = self._set_log()
+        self._log_text = []
+
+    def write(self, text):
+        if self._log:
+            self._log_text.append(text + '\n')
+            self._log.setText(''.join(self._log_text))
+        else:
+            print(text)
+
+    def _set_log(self):
+        if platform == 'js':
+            try:
+                pg.display.textbox_init()
+                log = pg.display.textarea
+                log.resize(600, 500)
+                log.toggle()
+            except:
+                log = None
+        else:
+            log = None
+        return log
+
+
+log = None
+cases = []
+case_num = -1
+results = []
+benchmark = None
+output = None
+
+
+def bench_init(warmup, repeat, number):
+    global log, benchmark
+    pg.init()
+    pg.display.set_mode((20, 20))
+    log = Log()
+    benchmark = Benchmark(warmup, repeat, number)
+
+
+def run_case():
+    case = cases[case_num]
+    result = benchmark.run_case(case)
+    if result is None:
+        log.write('Bench %-16s %10s' % (case.__name__[5:], 'skipped'))
+        return
+    results.append(result)
+    log.write('Bench %-16s %10.4f ms  (median %.4f, min %.4f, stdev %.4f)'
+              % (result['case'], result['mean'], result['median'],
+                 result['min'], result['stdev']))
+
+
+def run_cases():
+    global case_num
+    while case_num < len(cases)-1:
+        case_num += 1
+        run_case()
+    bench_complete()
+
+
+def run_cases_js():
+    global case_num
+    if case_num < len(cases)-1:
+        case_num += 1
+        run_case()
+    elif case_num == len(cases)-1:
+        case_num += 1
+        bench_complete()
+
+
+def bench_complete():
+    data = '\n'.join([json.dumps(result) for result in results])
+    log.write('')
+    log.write(data)
+    if output and platform != 'js':
+        fp = open(output, 'w')
+        fp.write(data + '\n')
+        fp.close()
+    pg.quit()
+
+
+def main(bench=None, warmup=5, repeat=10, number=10, output_file=None):
+    global output
+    if bench:
+        for name in bench:
+            cases.append(bench_case_name[name])
+    else:
+        cases.extend(bench_cases)
+    output = output_file
+    bench_init(warmup, repeat, number)
+    if platform in ('pc', 'jvm'):
+        run_cases()
+    else:
+        pg.setup(run_cases_js)
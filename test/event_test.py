@@ -12,7 +12,10 @@ def init(environ):
              test_event_peek,
              test_event_clear,
              test_event_block,
-             test_event_post]
+             test_event_post,
+             test_event_attr,
+             test_event_pool,
+             test_event_coalesce]
     return tests
 
 
@@ -143,3 +146,74 @@ def test_event_post():
     e = [ev for ev in evts if ev.type==pg.USEREVENT][0]
     assert (e.type==pg.USEREVENT and e.x==1 and e.y==2 and e.z==3)
 
+
+def test_event_attr():
+    evt = pg.event.Event(pg.USEREVENT, pos=(1,2), button=1, z=3)
+    assert evt.type == pg.USEREVENT
+    assert (evt.pos == (1,2) and evt.button == 1 and evt.z == 3)
+    evt = pg.event.Event(pg.USEREVENT, {'key':pg.K_a, 'mod':0, 'w':4})
+    assert (evt.key == pg.K_a and evt.mod == 0 and evt.w == 4)
+    evt.key = pg.K_b
+    evt.w = 5
+    assert (evt.key == pg.K_b and evt.w == 5)
+    evt.v = 6
+    assert evt.v == 6
+    if env['library'] == 'pyjsdl' and env['pyjs_attr']:
+        assert evt.attr == {'w':5, 'v':6}
+        evt.attr['w'] = 7
+        evt.attr['u'] = 8
+        assert (evt.w == 7 and evt.u == 8)
+        assert (evt.key == pg.K_b and 'key' not in evt.attr)
+
+
+def test_event_pool():
+    if env['library'] != 'pyjsdl':
+        raise NotImplementedError
+    from pyjsdl.event import EventPool
+    class Evt(object):
+        def __init__(self, val):
+            self.val = val
+    pool = EventPool(Evt)
+    evt = pool.get(1)
+    pool.put(evt)
+    pool.put(evt)
+    assert len(pool) == 1
+    assert pool.get(2) is evt and evt.val == 2
+    assert pool.get(3) is not evt
+    pg.event.set_pool(True)
+    pg.event.clear()
+    pg.event.post(pg.event.Event(pg.USEREVENT))
+    assert len(pg.event.get()) == 1
+    pg.event.recycle()
+    pg.event.recycle()
+    assert pg.event.get() == []
+    pg.event.set_pool(False)
+
+
+def test_event_coalesce():
+    if env['library'] != 'pyjsdl':
+        raise NotImplementedError
+    from pyjsdl.event import MouseWheelDownEvent, MouseWheelUpEvent
+    from pyjsdl.event import MouseWheelEvent
+    class Wheel(object):
+        def __init__(self):
+            self.deltaX = 0
+            self.deltaY = -1
+    wheel = Wheel()
+    pg.event.clear()
+    pg.event.set_allowed([pg.MOUSEBUTTONDOWN, pg.MOUSEBUTTONUP, pg.MOUSEWHEEL])
+    pg.event.set_coalesce(pg.MOUSEWHEEL)
+    for i in range(3):
+        pg.event._updateQueue(MouseWheelDownEvent(wheel, 0, 0))
+        pg.event._updateQueue(MouseWheelUpEvent(wheel, 0, 0))
+        pg.event._updateQueue(MouseWheelEvent(wheel))
+    evts = pg.event.get(pg.MOUSEWHEEL)
+    assert len(evts) == 1 and evts[0].y == 3
+    assert len(pg.event.get(pg.MOUSEBUTTONDOWN)) == 3
+    assert len(pg.event.get(pg.MOUSEBUTTONUP)) == 3
+    pg.event._updateQueue(MouseWheelEvent(wheel))
+    pg.event.post(pg.event.Event(pg.USEREVENT))
+    pg.event._updateQueue(MouseWheelEvent(wheel))
+    assert len(pg.event.get(pg.MOUSEWHEEL)) == 2
+    pg.event.set_coalesce(pg.MOUSEWHEEL, False)
+    pg.event.clear()
@@ -42,6 +42,7 @@ from test import sprite_test
 from test import event_test
 from test import time_test
 from test import vector_test
+from test import mixer_test
 
 
 if executor in ('python', 'jython', 'pyjs'):
@@ -109,7 +110,8 @@ lib_tests = [surface_test,
              sprite_test,
              event_test,
              time_test,
-             vector_test]
+             vector_test,
+             mixer_test]
 
 
 lib_test_name = {'surface_test': surface_test,
@@ -123,7 +125,8 @@ lib_test_name = {'surface_test': surface_test,
                  'sprite_test': sprite_test,
                  'event_test': event_test,
                  'time_test': time_test,
-                 'vector_test': vector_test}
+                 'vector_test': vector_test,
+                 'mixer_test': mixer_test}
 
 
 env = {}
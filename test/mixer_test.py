@@ -0,0 +1,44 @@
+env = None
+pg = None
+
+
+def init(environ):
+    global env, pg
+    env = environ
+    pg = env['pg']
+    tests = [test_mixer_webaudio_fallback,
+             test_mixer_instance_cap]
+    return tests
+
+
+def test_mixer_webaudio_fallback():
+    if env['library'] != 'pyjsdl':
+        raise NotImplementedError
+    if pg.mixer.set_engine('webaudio') != 'webaudio':
+        raise NotImplementedError
+    try:
+        sound = pg.mixer.Sound('data/fallback.ogg')
+        channel = sound.play()
+        assert channel is not None and sound._waiting == [channel]
+        sound._set_element('data/fallback.ogg')
+        assert sound._waiting == [] and sound._webaudio is None
+        assert not channel.get_busy() and channel.get_sound() is None
+        assert sound.get_num_channels() == 0
+    finally:
+        pg.mixer.set_engine('audio')
+
+
+def test_mixer_instance_cap():
+    if env['library'] != 'pyjsdl':
+        raise NotImplementedError
+    sound = pg.mixer.Sound('data/cap.ogg')
+    sound.set_max_instances(1)
+    pg.mixer.set_reserved(1)
+    try:
+        pg.mixer.Channel(0).play(sound)
+        assert sound.get_num_channels() == 1
+        assert sound.play() is None
+        assert sound.get_num_channels() == 1
+    finally:
+        sound.stop()
+        pg.mixer.set_reserved(0)
@@ -16,7 +16,9 @@ def init(environ):
              test_rect_union,
              test_rect_collidepoint,
              test_rect_colliderect,
-             test_rect_collidelist]
+             test_rect_collidelist,
+             test_rect_array,
+             test_rect_sweep]
     return tests
 
 
@@ -212,3 +214,40 @@ def test_rect_collidelist():
     assert r1.collidelist([r3,r4,r2]) == 1
     assert r1.collidelist([r3]) == -1
 
+
+
+def test_rect_array():
+    if env['library'] != 'pyjsdl':
+        raise NotImplementedError
+    from pyjsdl.rect import RectArray
+    rects = [pg.Rect(i*10,0,12,12) for i in range(20)]
+    r = pg.Rect(15,0,20,5)
+    array = RectArray(rects)
+    assert len(array) == 20
+    assert array.get(3) == rects[3]
+    assert array.collidepoint(25,5) == [2]
+    assert array.collidepoint((25,5)) == [2]
+    assert array.colliderect(r) == r.collidelistall(rects)
+    assert array.collidelist(r) == r.collidelist(rects)
+    assert array.collidelistall([r,pg.Rect(195,0,5,5)]) == [(1,0),(2,0),(3,0),(19,1)]
+    assert array.clip(r).to_rects() == [rect.clip(r) for rect in rects]
+    assert array.union() == rects[0].unionall(rects)
+    array.move_ip(1,2)
+    assert array.get(0) == pg.Rect(1,2,12,12)
+    array.append(pg.Rect(5,5,5,5))
+    assert len(array) == 21 and array.get(20) == pg.Rect(5,5,5,5)
+    array.from_rects(rects)
+    assert array.to_rects() == rects
+
+
+def test_rect_sweep():
+    if env['library'] != 'pyjsdl':
+        raise NotImplementedError
+    r = pg.Rect(0,0,10,10)
+    wall = pg.Rect(50,0,1,100)
+    assert r.sweep(wall, (100,0)) == (0.4, (-1.0,0.0))
+    assert r.sweep(wall, (30,0)) is None
+    assert r.sweep(pg.Rect(0,50,100,10), (0,100)) == (0.4, (0.0,-1.0))
+    assert r.sweep(pg.Rect(-20,0,5,10), (-40,0)) == (0.375, (1.0,0.0))
+    assert r.sweep(pg.Rect(10,0,5,5), (0,10)) is None
+    assert r.sweep(pg.Rect(5,5,10,10), (10,0)) == (0.0, (0.0,0.0))
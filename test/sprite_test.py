@@ -7,7 +7,17 @@ def init(environ):
     env = environ
     pg = env['pg']
     tests = [test_sprite,
-             test_sprite_group]
+             test_sprite_group,
+             test_sprite_ordered,
+             test_sprite_layered,
+             test_sprite_sorted,
+             test_sprite_spatial,
+             test_sprite_cull,
+             test_sprite_camera,
+             test_sprite_retained,
+             test_sprite_collide,
+             test_sprite_broadphase,
+             test_sprite_sweep]
     return tests
 
 
@@ -104,3 +114,335 @@ def test_sprite_group():
             assert g.has([s[0],s[1],s[2]]) == r[2]
             assert g.has([s[2],s[5]],s[6]) == r[3]
 
+
+
+def test_sprite_ordered():
+    Sprite = pg.sprite.Sprite
+    s = [Sprite() for i in range(100)]
+    grp = pg.sprite.OrderedUpdates(s)
+    for sprite in grp:
+        if s.index(sprite) % 3 == 0:
+            sprite.kill()
+    assert grp.sprites() == [sprite for sprite in s if s.index(sprite) % 3]
+    for sprite in s[:50]:
+        grp.remove(sprite)
+    grp.add(s[0])
+    assert grp.sprites() == [sprite for sprite in s[50:] if s.index(sprite) % 3] + [s[0]]
+    assert len(grp) == 34
+
+
+def test_sprite_layered():
+    Sprite = pg.sprite.Sprite
+    s = [Sprite() for i in range(6)]
+    grp = pg.sprite.LayeredUpdates()
+    grp.add(s[0], s[1], layer=1)
+    grp.add(s[2], layer=0)
+    grp.add(s[3], s[4], layer=2)
+    grp.add(s[5], layer=1)
+    assert grp.sprites() == [s[2],s[0],s[1],s[5],s[3],s[4]]
+    assert grp.layers() == [0,1,2]
+    assert grp.get_layer_of_sprite(s[5]) == 1
+    assert grp.get_sprites_from_layer(1) == [s[0],s[1],s[5]]
+    grp.change_layer(s[0], 2)
+    assert grp.sprites() == [s[2],s[1],s[5],s[3],s[4],s[0]]
+    assert grp.get_layer_of_sprite(s[0]) == 2
+    grp.move_to_back(s[3])
+    assert grp.layers() == [-1,0,1,2]
+    assert grp.get_sprite(0) == s[3]
+    grp.move_to_front(s[1])
+    assert grp.get_top_sprite() == s[1]
+    grp.switch_layer(1, 2)
+    assert grp.get_sprites_from_layer(1) == [s[4],s[0],s[1]]
+    assert grp.get_sprites_from_layer(2) == [s[5]]
+    s[2].kill()
+    assert grp.layers() == [-1,1,2]
+    assert grp.remove_sprites_of_layer(1) == [s[4],s[0],s[1]]
+    assert grp.sprites() == [s[3],s[5]]
+    assert len(grp) == 2
+
+
+def test_sprite_sorted():
+    if env['library'] != 'pyjsdl':
+        raise NotImplementedError
+    Sprite = pg.sprite.Sprite
+    s = [Sprite() for i in range(20)]
+    for i, sprite in enumerate(s):
+        sprite.rect = pg.Rect(0, (i*7)%20, 10, 10)
+        sprite.depth = -i
+    grp = pg.sprite.SortedUpdates(s)
+    grp.sort()
+    bottom = [sprite.rect.y+sprite.rect.height for sprite in grp]
+    assert bottom == sorted(bottom)
+    s[0].rect.y = 50
+    s[5].rect.y = 1
+    grp.sort()
+    assert grp.sprites()[-1] == s[0]
+    bottom = [sprite.rect.y+sprite.rect.height for sprite in grp]
+    assert bottom == sorted(bottom)
+    order = grp.sprites()
+    sprites = iter(grp)
+    grp.set_key('depth')
+    grp.sort()
+    assert list(sprites) == order
+    assert grp.sprites() == s[::-1]
+
+
+def test_sprite_spatial():
+    if env['library'] != 'pyjsdl':
+        raise NotImplementedError
+    Sprite = pg.sprite.Sprite
+    s = [Sprite() for i in range(10)]
+    for i, sprite in enumerate(s):
+        sprite.rect = pg.Rect(i*30, i*30, 40, 40)
+        sprite._layer = 10 - i
+    grp = pg.sprite.LayeredUpdates(s)
+    grp.set_spatial_index(32)
+    assert grp.get_sprites_at((65,65)) == [s[2],s[1]]
+    assert grp.get_sprites_in(pg.Rect(50,50,50,50)) == [s[3],s[2],s[1]]
+    assert grp.get_nearest_sprite((500,500)) == s[9]
+    assert grp.get_nearest_sprite((500,500), 100) is None
+    s[1].rect.x = 200
+    grp.update_spatial_index(s[1])
+    assert grp.get_sprites_at((65,65)) == [s[2]]
+    s[2].kill()
+    assert grp.get_sprites_at((65,65)) == []
+    s[3].rect.x = 400
+    s[3].rect.y = 0
+    grp.update()
+    assert grp.get_sprites_at((410,10)) == [s[3]]
+    assert grp.get_nearest_sprite((450,-50)) == s[3]
+
+
+def test_sprite_cull():
+    if env['library'] != 'pyjsdl':
+        raise NotImplementedError
+    surface = pg.Surface((100,100))
+    image = pg.Surface((20,20))
+    grp = pg.sprite.RenderUpdates()
+    for i in range(10):
+        sprite = pg.sprite.Sprite(grp)
+        sprite.image = image
+        sprite.rect = pg.Rect(i*30-40, 0, 20, 20)
+    rects = grp.draw(surface)
+    assert len(rects) == 10 and grp.get_culled() == 0
+    rects = grp.draw(surface, surface.get_rect())
+    assert len(rects) == 4 and grp.get_culled() == 6
+    rects = grp.draw(surface, pg.Rect(150,0,100,100))
+    assert len(rects) == 4 and grp.get_culled() == 6
+    grp.set_spatial_index(32)
+    rects = grp.draw(surface, surface.get_rect())
+    assert len(rects) == 4 and grp.get_culled() == 6
+    sprite = pg.sprite.Sprite()
+    sprite.image = image
+    sprite.rect = pg.Rect(-15,0,5,5)
+    grp.add(sprite)
+    grp.draw(surface, surface.get_rect())
+    assert grp.get_culled() == 6
+
+
+def test_sprite_camera():
+    if env['library'] != 'pyjsdl':
+        raise NotImplementedError
+    surface = pg.Surface((100,100))
+    image = pg.Surface((10,10))
+    grp = pg.sprite.RenderUpdates()
+    s = [pg.sprite.Sprite(grp) for i in range(20)]
+    for i, sprite in enumerate(s):
+        sprite.image = image
+        sprite.rect = pg.Rect(i*20, 0, 10, 10)
+    camera = pg.sprite.Camera(100, 0, 2)
+    assert camera.get_view(surface) == pg.Rect(100,0,50,50)
+    rects = grp.draw(surface, camera=camera)
+    assert sorted([r.x for r in rects]) == [0,40,80]
+    assert rects[0].width == 20 and grp.get_culled() == 17
+    assert s[5].rect == pg.Rect(100,0,10,10)
+    assert camera.to_world((50,50)) == (125,25)
+    assert camera.to_screen(pg.Rect(130,0,10,10)) == pg.Rect(60,0,20,20)
+
+
+def test_sprite_retained():
+    if env['library'] != 'pyjsdl':
+        raise NotImplementedError
+    surface = pg.Surface((100,100))
+    background = pg.Surface((100,100))
+    grp = pg.sprite.RetainedUpdates()
+    s = [pg.sprite.Sprite() for i in range(5)]
+    for i, sprite in enumerate(s):
+        sprite.image = pg.Surface((10,10))
+        sprite.rect = pg.Rect(i*20, 0, 10, 10)
+        grp.add(sprite)
+    rects = grp.draw_retained(surface, background)
+    assert len(rects) == 5
+    rects = grp.draw_retained(surface)
+    assert len(rects) == 0
+    s[2].rect.x += 5
+    rects = grp.draw_retained(surface)
+    assert len(rects) == 1 and rects[0] == pg.Rect(40,0,15,10)
+    s[3].image.set_alpha(128)
+    s[4].kill()
+    rects = grp.draw_retained(surface)
+    assert len(rects) == 2
+    grp.change_layer(s[0], 1)
+    rects = grp.draw_retained(surface)
+    assert len(rects) == 1 and rects[0] == pg.Rect(0,0,10,10)
+    s[1].rect.size = (4,4)
+    rects = grp.draw_retained(surface)
+    assert len(rects) == 0
+    s[1].rect.x += 5
+    rects = grp.draw_retained(surface)
+    assert len(rects) == 1 and rects[0] == pg.Rect(20,0,15,10)
+    grp.repaint()
+    rects = grp.draw_retained(surface)
+    assert len(rects) == 4
+    rects = grp.draw(surface)
+    assert len(rects) == 4 and grp.get_background() is background
+
+
+def test_sprite_collide():
+    Sprite = pg.sprite.Sprite
+    s = [Sprite() for i in range(20)]
+    for i, sprite in enumerate(s):
+        sprite.rect = pg.Rect((i%5)*12, (i//5)*12, 10, 10)
+    s1, s2 = Sprite(), Sprite()
+    s1.rect = pg.Rect(0,0,10,10)
+    s2.rect = pg.Rect(12,0,10,10)
+    assert pg.sprite.collide_rect_ratio(1.5)(s1, s2) == True
+    assert pg.sprite.collide_rect_ratio(1.0)(s1, s2) == False
+    s1.radius, s2.radius = 5, 5
+    assert pg.sprite.collide_circle(s1, s2) == False
+    s2.rect.x = 10
+    assert pg.sprite.collide_circle(s1, s2) == True
+    assert pg.sprite.collide_circle_ratio(0.5)(s1, s2) == False
+    s3, s4 = Sprite(), Sprite()
+    s3.rect = pg.Rect(0,0,30,40)
+    s4.rect = pg.Rect(45,0,30,40)
+    assert pg.sprite.collide_circle(s3, s4) == True
+    s3.rect.size = (6,8)
+    assert pg.sprite.collide_circle(s3, s4) == False
+    grp = pg.sprite.OrderedUpdates(s)
+    sprite = Sprite()
+    sprite.rect = pg.Rect(15,15,20,20)
+    collide = pg.sprite.spritecollide(sprite, grp, False)
+    assert collide == [s[6],s[7],s[11],s[12]]
+    assert pg.sprite.spritecollideany(sprite, grp)
+    if env['library'] == 'pyjsdl':
+        grp.set_spatial_index(16)
+        assert pg.sprite.spritecollide(sprite, grp, False) == collide
+        collided = pg.sprite.collide_circle_ratio(0.5)
+        assert pg.sprite.spritecollide(sprite, grp, False, collided) == [s[7],s[11],s[12]]
+        s[12].rect.x = 200
+        grp.update_spatial_index(s[12])
+        assert pg.sprite.spritecollide(sprite, grp, True) == [s[6],s[7],s[11]]
+        assert len(grp) == 17
+        assert pg.sprite.groupcollide([sprite], grp, False, False) == {}
+        s[19].rect.x = 20
+        s[19].rect.y = 20
+        grp.update()
+        assert pg.sprite.spritecollide(sprite, grp, False) == [s[19]]
+        assert pg.sprite.spritecollideany(sprite, grp)
+        assert pg.sprite.groupcollide([sprite], grp, False, False) == {sprite: [s[19]]}
+
+
+def test_sprite_broadphase():
+    if env['library'] != 'pyjsdl':
+        raise NotImplementedError
+    class Mover(pg.sprite.Sprite):
+        def __init__(self, x, dx):
+            pg.sprite.Sprite.__init__(self)
+            self.rect = pg.Rect(x, 0, 10, 10)
+            self.dx = dx
+        def update(self):
+            self.rect.x += self.dx
+    s = [Mover(i*40, 8) for i in range(5)]
+    grp = pg.sprite.Group(*s)
+    grp.set_spatial_index(32)
+    spatial = grp.get_spatial_index()
+    updates = []
+    spatial_update = spatial.update
+    def update(sprites):
+        updates.append(1)
+        spatial_update(sprites)
+    spatial.update = update
+    sprite = pg.sprite.Sprite()
+    sprite.rect = pg.Rect(100,0,20,10)
+    for frame in range(10):
+        grp.update()
+        colliding = [_sprite for _sprite in s
+                     if _sprite.rect.colliderect(sprite.rect)]
+        for i in range(3):
+            collide = pg.sprite.spritecollide(sprite, grp, False)
+            assert (len(collide) == len(colliding) and
+                    all([_sprite in colliding for _sprite in collide]))
+            assert (bool(pg.sprite.spritecollideany(sprite, grp)) ==
+                    (len(colliding) > 0))
+    assert len(updates) == 10
+
+
+def test_sprite_sweep():
+    if env['library'] != 'pyjsdl':
+        raise NotImplementedError
+    Sprite = pg.sprite.Sprite
+    bullet = Sprite()
+    bullet.rect = pg.Rect(0,0,4,4)
+    bullets = pg.sprite.Group(bullet)
+    bullets.track_rects()
+    w = [Sprite() for i in range(3)]
+    w[0].rect = pg.Rect(100,0,2,50)
+    w[1].rect = pg.Rect(60,0,2,50)
+    w[2].rect = pg.Rect(100,100,2,50)
+    walls = pg.sprite.Group(w)
+    walls.track_rects()
+    bullet.rect.x = 200
+    w[0].rect.x = 0
+    assert pg.sprite.spritecollide(bullet, walls, False) == []
+    hits = pg.sprite.sweepcollide(bullet, walls, False)
+    assert [hit[0] for hit in hits] == [w[1],w[0]]
+    assert hits[0][1] == 0.28 and hits[0][2] == (-1.0,0.0)
+    assert hits[1][1] == 0.32
+    assert walls.get_previous_rect(w[0]) == pg.Rect(100,0,2,50)
+    walls.update()
+    assert walls.get_previous_rect(w[0]) == pg.Rect(0,0,2,50)
+    bullet.radius = 2
+    hits = pg.sprite.sweepcollide(bullet, walls, False, True)
+    assert [hit[0] for hit in hits] == [w[0],w[1]]
+    assert hits[0][1] == 0.0
+    pg.sprite.sweepcollide(bullet, walls, True)
+    assert len(walls) == 1
+    post = Sprite()
+    post.rect = pg.Rect(100,10,2,2)
+    post.radius = 1
+    posts = pg.sprite.Group(post)
+    bullet.radius = 10
+    assert pg.sprite.sweepcollide(bullet, posts, False) == []
+    hits = pg.sprite.sweepcollide(bullet, posts, False, True)
+    assert [hit[0] for hit in hits] == [post]
+
+
+def bench_sprite_updates(size):
+    """
+    Benchmark RenderUpdates clear and draw of size moving sprites.
+
+    Return run function of one frame and case information including heap bytes allocated in a steady-state frame, for test/benchtest.py.
+    """
+    from test.benchtest import memory_used
+    surface = pg.Surface((400,400))
+    background = pg.Surface((400,400))
+    image = pg.Surface((10,10))
+    group = pg.sprite.RenderUpdates()
+    sprites = []
+    for i in range(size):
+        sprite = pg.sprite.Sprite(group)
+        sprite.image = image
+        sprite.rect = pg.Rect((i*7)%390, (i*13)%390, 10, 10)
+        sprites.append(sprite)
+    step = [1]
+    def run():
+        step[0] = -step[0]
+        for sprite in sprites:
+            sprite.rect.x += step[0]
+        group.clear(surface, background)
+        return group.draw(surface)
+    for i in range(3):
+        run()
+    rects, memory = memory_used(run)
+    return run, {'ops': size, 'bytes_per_frame': memory}
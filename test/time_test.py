@@ -9,7 +9,8 @@ def init(environ):
     pg = env['pg']
     tests = [test_time_delay,
              test_time_wait,
-             test_time_timer]
+             test_time_timer,
+             test_time_interval]
     return tests
 
 
@@ -65,3 +66,20 @@ def test_time_timer():
             wait = 0
             return False
 
+
+def test_time_interval():
+    if env['library'] != 'pyjsdl':
+        raise NotImplementedError
+    class Obj(object):
+        def __init__(self):
+            self.count = 0
+        def run(self):
+            self.count += 1
+    obj = Obj()
+    scheduler = pg.time._scheduler
+    id = pg.time.set_interval(obj, 0)
+    now = scheduler._timers[id][0]
+    scheduler.run(now)
+    scheduler.run(now + 10)
+    pg.time.clear_interval(id)
+    assert obj.count == 2
@@ -14,7 +14,8 @@ def init(environ):
              test_vector_direction,
              test_vector_dot,
              test_vector_cross,
-             test_vector_lerp]
+             test_vector_lerp,
+             test_vector_sweep]
     return tests
 
 
@@ -329,3 +330,16 @@ def test_vector_lerp():
     v = Vector2(5.0, 5.0).slerp(Vector2(-5.0, 5.0), 0.2)
     assert _rd(v.x) == 3.210 and _rd(v.y) == 6.300
 
+
+def test_vector_sweep():
+    if env['library'] != 'pyjsdl':
+        raise NotImplementedError
+    Vector2 = pg.Vector2
+    v = Vector2(0.0, 0.0)
+    t, normal = v.sweep_circle(5, (100,0), (50,0), 5)
+    assert _rd(t) == 0.4 and normal == (-1.0,0.0)
+    t, normal = v.sweep_circle(5, (0,-100), (0,-50), 5)
+    assert _rd(t) == 0.4 and normal == (0.0,1.0)
+    assert v.sweep_circle(5, (100,0), (50,20), 5) is None
+    assert v.sweep_circle(5, (-100,0), (50,0), 5) is None
+    assert v.sweep_circle(5, (10,0), (5,0), 5) == (0.0, (0.0,0.0))